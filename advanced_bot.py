@@ -1,63 +1,198 @@
-import schedule
-import telegram
-from telegram.ext import Application, CommandHandler
 import asyncio
-from matka_predictor import KalyanMatkaPredictor
-import time
-from datetime import datetime
+import contextvars
+import os
+from market_registry import MarketRegistry
+from history_store import HistoryStore
+from model_cache import ModelCache
+from instrumentation import stage, profiled
+from telegram_delivery import DeliveryQueue, SubscriberRegistry, TelegramTransport
+from command_server import CommandServer, ServingState
+from exporters import atomic_file
+from datetime import datetime, timedelta
 
 class AdvancedMatkaBot:
-    def __init__(self, telegram_token=None):
-        self.predictor = KalyanMatkaPredictor()
+    def __init__(self, telegram_token=None, chat_id="YOUR_CHAT_ID", schedule_times=("09:00", "21:00"), registry=None,
+                 profile_dir=None, subscribers=None, transport=None, serve_commands=True, simulate=False):
         self.telegram_token = telegram_token
+        self.chat_id = chat_id  # Replace with actual chat ID
+        self.schedule_times = schedule_times
         
-    async def send_telegram_alert(self, message):
-        """Send prediction via Telegram"""
-        if self.telegram_token:
-            bot = telegram.Bot(token=self.telegram_token)
-            # Add your chat_id here
-            chat_id = "YOUR_CHAT_ID"  # Replace with actual chat ID
-            await bot.send_message(chat_id=chat_id, text=message)
+        # Chats that receive reports; chat_id is subscribed to every market
+        self.subscribers = subscribers if subscribers is not None else SubscriberRegistry()
+        if chat_id and chat_id != "YOUR_CHAT_ID" and chat_id not in self.subscribers:
+            self.subscribers.subscribe(chat_id)
+        # Outbound messages go through one queue and one persistent client;
+        # pass a telegram_delivery.MockTransport to run without Telegram
+        if transport is None and telegram_token:
+            transport = TelegramTransport(telegram_token)
+        self.delivery = DeliveryQueue(transport) if transport is not None else None
+        # When set, the next job's blocking steps run under cProfile, one .prof file per market
+        self.profile_dir = profile_dir
+        
+        # Markets to report on; by default just Kalyan, using the existing history and model
+        # folders (topped up with simulated draws only when `simulate` is set)
+        if registry is None:
+            registry = MarketRegistry()
+            registry.register('Kalyan', store=HistoryStore(), model_cache=ModelCache(), simulate=simulate)
+        self.registry = registry
+        
+        # CPU-heavy job steps run on the registry's shared pool so the event loop stays responsive
+        self.executor = registry.executor
+        # One job at a time per market; separate markets run concurrently. Locks are
+        # created on a market's first job, so markets registered later get one too
+        self.job_locks = {}
+        self.running_jobs = set()
+        
+        # /today, /hot, /prob and /history answer from the state each job publishes
+        self.serve_commands = serve_commands
+        self.commands = CommandServer(default_market=next(iter(registry)).name if len(registry) else None)
+        self.application = None
+    
+    async def start_client(self):
+        """Open the Telegram client and start the delivery workers"""
+        if self.delivery is not None:
+            await self.delivery.start()
+    
+    async def stop_client(self):
+        """Deliver anything still queued, then close the Telegram client"""
+        if self.delivery is not None:
+            await self.delivery.close()
+    
+    async def send_telegram_alert(self, message, market=None):
+        """Queue a prediction for every chat subscribed to `market`"""
+        if self.delivery is not None:
+            chat_ids = self.subscribers.for_market(market)
+            with stage('bot.send_telegram_alert', chars=len(message), chats=len(chat_ids)):
+                await self.delivery.broadcast(message, chat_ids)
+            return len(chat_ids)
+        return 0
+    
+    @staticmethod
+    def next_run(at, now=None):
+        """Next wall-clock datetime matching an "HH:MM" schedule time"""
+        now = now or datetime.now()
+        hour, minute = map(int, at.split(':'))
+        target = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if target <= now:
+            target += timedelta(days=1)
+        return target
+    
+    async def _run_daily_at(self, at, job):
+        """Fire `job` every day at `at`, without waiting for earlier runs to finish"""
+        while True:
+            target = self.next_run(at)
+            # Sleep in short steps and re-check the wall clock, so clock changes or
+            # a suspended host cannot make the job fire late
+            while (delay := (target - datetime.now()).total_seconds()) > 0:
+                await asyncio.sleep(min(delay, 60))
+            
+            task = asyncio.create_task(job())
+            self.running_jobs.add(task)
+            task.add_done_callback(self.running_jobs.discard)
+    
+    async def start_commands(self):
+        """Start answering bot commands (long polling) on the current event loop"""
+        if self.serve_commands and self.telegram_token and self.application is None:
+            self.application = self.commands.build_application(self.telegram_token)
+            await self.application.initialize()
+            await self.application.start()
+            await self.application.updater.start_polling()
+    
+    async def stop_commands(self):
+        if self.application is not None:
+            await self.application.updater.stop()
+            await self.application.stop()
+            await self.application.shutdown()
+            self.application = None
+    
+    async def run_scheduler(self):
+        """Run every scheduled job on the current event loop until cancelled"""
+        await self.start_client()
+        await self.start_commands()
+        try:
+            await asyncio.gather(*(self._run_daily_at(at, self.run_prediction_job) for at in self.schedule_times))
+        finally:
+            for task in list(self.running_jobs):
+                task.cancel()
+            await self.stop_commands()
+            await self.stop_client()
     
     def schedule_predictions(self):
         """Schedule daily predictions"""
         print("[INFO] Scheduling daily predictions...")
-        schedule.every().day.at("09:00").do(self.daily_prediction_job)
-        schedule.every().day.at("21:00").do(self.daily_prediction_job)
         
-        print("[INFO] Bot is running. Predictions scheduled for 9:00 AM and 9:00 PM daily.")
+        times = ' and '.join(self.schedule_times)
+        print(f"[INFO] Bot is running. Predictions scheduled for {times} daily.")
         print("Press Ctrl+C to stop the bot.")
         
         try:
-            while True:
-                schedule.run_pending()
-                time.sleep(60)
+            asyncio.run(self.run_scheduler())
         except KeyboardInterrupt:
             print("\n[STOP] Bot stopped by user.")
     
-    def daily_prediction_job(self):
-        """Automated daily prediction job"""
-        print(f"[INFO] Running scheduled prediction at {datetime.now()}")
+    def _prediction_steps(self, market, workers, profile_dir=None):
+        """Load, train, report and save one market; blocking, runs in the executor"""
+        if profile_dir:
+            os.makedirs(profile_dir, exist_ok=True)
+            path = os.path.join(profile_dir, f'{market.slug}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.prof')
+            with profiled(path):
+                report = market.generate_report(workers)
+        else:
+            report = market.generate_report(workers)
         
+        # Save to file
+        filename = f'scheduled_prediction_{market.slug}_{datetime.now().strftime("%Y%m%d_%H%M")}.txt'
+        with atomic_file(filename, 'w', encoding='utf-8') as f:
+            f.write(report)
+        return report, filename, ServingState.from_predictor(market.predictor, report)
+    
+    async def run_market_job(self, market, workers, profile_dir=None):
+        """Prediction job for a single market"""
         try:
-            self.predictor.scrape_historical_data()
-            self.predictor.train_prediction_model()
-            report = self.predictor.generate_daily_report()
+            async with self.job_locks.setdefault(market.name, asyncio.Lock()):
+                loop = asyncio.get_running_loop()
+                with stage('bot.prediction_steps', market=market.name):
+                    report, filename, state = await loop.run_in_executor(
+                        self.executor, contextvars.copy_context().run,
+                        self._prediction_steps, market, workers, profile_dir
+                    )
+                self.commands.publish(state)
             
-            # Save to file
-            filename = f'scheduled_prediction_{datetime.now().strftime("%Y%m%d_%H%M")}.txt'
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(report)
-            
-            # Send via Telegram if token is configured
-            if self.telegram_token:
-                asyncio.run(self.send_telegram_alert(report))
-                print("[INFO] Prediction sent via Telegram")
-            
-            print(f"[OK] Scheduled prediction completed and saved to {filename}")
+            # Queue for Telegram delivery if a transport is configured
+            if self.delivery is not None:
+                chats = await self.send_telegram_alert(report, market=market.name)
+                print(f"[INFO] {market.name} prediction queued for {chats} Telegram chats")
             
+            print(f"[OK] Scheduled {market.name} prediction completed and saved to {filename}")
+        
         except Exception as e:
-            print(f"[ERROR] Error during scheduled prediction: {e}")
+            print(f"[ERROR] Error during scheduled {market.name} prediction: {e}")
+    
+    async def run_prediction_job(self):
+        """Automated daily prediction job for every registered market"""
+        print(f"[INFO] Running scheduled prediction at {datetime.now()}")
+        
+        workers = self.registry.training_workers()
+        # Profiling covers a single job run
+        profile_dir, self.profile_dir = self.profile_dir, None
+        with stage('bot.prediction_job', markets=len(self.registry)):
+            if profile_dir:
+                # cProfile sees one thread and (3.12+) one profiler at a time:
+                # train inline and profile the markets one after another
+                for market in self.registry:
+                    await self.run_market_job(market, 1, profile_dir)
+            else:
+                await asyncio.gather(*(self.run_market_job(market, workers) for market in self.registry))
+    
+    def daily_prediction_job(self):
+        """Run the prediction job once, outside the scheduler"""
+        async def run_once():
+            try:
+                await self.run_prediction_job()
+            finally:
+                await self.stop_client()
+        
+        asyncio.run(run_once())
 
 def main():
     print("[START] Starting Advanced Matka Bot...")
@@ -68,7 +203,7 @@ def main():
     # To use Telegram integration, replace None with your Telegram bot token
     telegram_token = None  # Replace with "YOUR_BOT_TOKEN" if you have one
     
-    bot = AdvancedMatkaBot(telegram_token=telegram_token)
+    bot = AdvancedMatkaBot(telegram_token=telegram_token, simulate=True)
     
     # Start scheduling
     bot.schedule_predictions()
@@ -0,0 +1,242 @@
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+import pandas as pd
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from history_store import HistoryStore, frame_dates
+from transition_model import TransitionModel
+
+FEATURES = ['day_of_week', 'day_of_month', 'month']
+
+# Shortest training window main() will backtest with
+MIN_TRAIN_DAYS = 90
+
+# Arrays shared by every fold; set in each worker process by _init_worker
+_ARRAYS = None
+
+def _init_worker(arrays):
+    global _ARRAYS
+    _ARRAYS = arrays
+
+def prepare_arrays(data):
+    """
+    Precompute the arrays every fold reads from
+    Prefix sums over the whole history let any window's jodi counts and
+    weekday means be read with one subtraction instead of a rescan.
+    """
+    data = data.sort_values('date', kind='stable')
+    jodi = data['jodi'].to_numpy().astype(np.int64)
+    features = data[FEATURES].to_numpy().astype(np.int64)
+    rows = np.arange(1, len(jodi) + 1)
+
+    jodi_prefix = np.zeros((len(jodi) + 1, 100), dtype=np.int32)
+    jodi_prefix[rows, jodi] = 1
+    weekday_count = np.zeros((len(jodi) + 1, 7), dtype=np.int32)
+    weekday_count[rows, features[:, 0]] = 1
+    weekday_sum = weekday_count * np.concatenate([[0], jodi])[:, None]
+
+    return {
+        'dates': np.datetime_as_string(frame_dates(data), unit='D'),
+        'jodi': jodi,
+        'features': features,
+        'jodi_prefix': np.cumsum(jodi_prefix, axis=0, dtype=np.int32),
+        'weekday_count': np.cumsum(weekday_count, axis=0, dtype=np.int64),
+        'weekday_sum': np.cumsum(weekday_sum, axis=0, dtype=np.int64)
+    }
+
+def _ml_candidates(arrays, fold, k):
+    """Forest retrained once per fold; candidates ranked by predict_proba"""
+    start, stop = fold['train']
+    model = RandomForestClassifier(n_estimators=fold['n_estimators'], random_state=42, n_jobs=1)
+    model.fit(arrays['features'][start:stop], arrays['jodi'][start:stop])
+    proba = model.predict_proba(arrays['features'][fold['test_idx']])
+    # A stable sort keeps the first maximum first, matching model.predict
+    return model.classes_[np.argsort(-proba, axis=1, kind='stable')[:, :k]]
+
+def _frequency_candidates(arrays, fold, k):
+    """Most frequent jodis in the history window before each test day"""
+    prefix = arrays['jodi_prefix']
+    counts = (prefix[fold['test_idx']] - prefix[fold['lo_idx']]).astype(np.int64)
+    counts[:, :10] = -1
+    return np.argsort(-counts, axis=1, kind='stable')[:, :k]
+
+def _pattern_candidates(arrays, fold, k):
+    """Weekday mean jodi before each test day, then the nearest jodis to it"""
+    test, lo = fold['test_idx'], fold['lo_idx']
+    weekday = arrays['features'][test, 0]
+    sums = arrays['weekday_sum'][test, weekday] - arrays['weekday_sum'][lo, weekday]
+    counts = arrays['weekday_count'][test, weekday] - arrays['weekday_count'][lo, weekday]
+    fallback = arrays['jodi'][:fold['train'][1]].mean()
+    picks = np.where(counts > 0, sums / np.maximum(counts, 1), fallback).astype(np.int64)
+
+    jodis = np.arange(10, 100)
+    distance = np.abs(jodis[None, :] - picks[:, None])
+    return jodis[np.argsort(distance, axis=1, kind='stable')[:, :k]]
+
+def _markov_candidates(arrays, fold, k):
+    """Jodi transition model fitted on the training window, then walked forward one draw at a time"""
+    start, stop = fold['train']
+    jodi = arrays['jodi']
+    model = TransitionModel(window=None if fold['window'] is None else fold['window'] - 1)
+    model.extend(jodi[start:stop])
+    candidates = []
+    for i in fold['test_idx']:
+        candidates.append(model.candidates(k))
+        model.push(jodi[i])
+    return np.array(candidates)
+
+# Strategy name -> candidate function(arrays, fold, k) returning an (n_test, k)
+# matrix whose first column is the strategy's pick
+STRATEGIES = {
+    'ml_prediction': _ml_candidates,
+    'frequency_prediction': _frequency_candidates,
+    'pattern_prediction': _pattern_candidates,
+    'markov_prediction': _markov_candidates
+}
+
+def _run_fold(fold):
+    arrays = _ARRAYS
+    actual = arrays['jodi'][fold['test_idx']]
+    results = []
+    for strategy in fold['strategies']:
+        start = time.perf_counter()
+        candidates = STRATEGIES[strategy](arrays, fold, fold['top_k'])
+        seconds = time.perf_counter() - start
+        results.append({
+            'fold': fold['fold'],
+            'strategy': strategy,
+            'train_start': arrays['dates'][fold['train'][0]],
+            'train_end': arrays['dates'][fold['train'][1] - 1],
+            'test_start': arrays['dates'][fold['test_idx'][0]],
+            'test_end': arrays['dates'][fold['test_idx'][-1]],
+            'train_rows': fold['train'][1] - fold['train'][0],
+            'test_rows': len(actual),
+            'accuracy': float(np.mean(candidates[:, 0] == actual)),
+            'top_k_hit_rate': float(np.mean((candidates == actual[:, None]).any(axis=1))),
+            'seconds': seconds
+        })
+    return results
+
+class WalkForwardBacktester:
+    """
+    Walk-forward evaluation of the prediction strategies over a draw history
+    Every fold trains only on draws before its test period, so no future rows
+    leak into training. The ML model is retrained every `test_days` draws;
+    statistical strategies are re-evaluated before each single test day.
+    """
+    def __init__(self, data, train_days=365, test_days=30, mode='expanding', top_k=5,
+                 strategies=None, n_estimators=100, workers=None):
+        if mode not in ('expanding', 'rolling'):
+            raise ValueError(f"Unknown window mode: {mode}")
+        self.arrays = prepare_arrays(data)
+        self.train_days = train_days
+        self.test_days = test_days
+        self.mode = mode
+        self.top_k = top_k
+        self.strategies = list(strategies or STRATEGIES)
+        self.n_estimators = n_estimators
+        self.workers = workers or os.cpu_count() or 1
+
+    @classmethod
+    def from_store(cls, store, start=None, end=None, **kwargs):
+        """Backtest over a date window of a HistoryStore"""
+        return cls(store.load(start=start, end=end), **kwargs)
+
+    def folds(self):
+        """Train/test bounds for every fold"""
+        folds = []
+        total = len(self.arrays['jodi'])
+        for fold, split in enumerate(range(self.train_days, total, self.test_days)):
+            test_idx = np.arange(split, min(split + self.test_days, total))
+            if self.mode == 'rolling':
+                train = (split - self.train_days, split)
+                lo_idx = test_idx - self.train_days
+            else:
+                train = (0, split)
+                lo_idx = np.zeros_like(test_idx)
+            folds.append({
+                'fold': fold,
+                'train': train,
+                'test_idx': test_idx,
+                'lo_idx': lo_idx,
+                'window': self.train_days if self.mode == 'rolling' else None,
+                'top_k': self.top_k,
+                'strategies': self.strategies,
+                'n_estimators': self.n_estimators
+            })
+        return folds
+
+    def run(self):
+        """Evaluate every fold, in parallel across processes, as a per-fold DataFrame"""
+        folds = self.folds()
+        print(f"[INFO] Backtesting {len(self.strategies)} strategies over {len(folds)} folds ({self.mode} window)...")
+        start = time.perf_counter()
+
+        if self.workers == 1 or len(folds) <= 1:
+            _init_worker(self.arrays)
+            fold_results = [_run_fold(fold) for fold in folds]
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                     initargs=(self.arrays,)) as executor:
+                fold_results = list(executor.map(_run_fold, folds))
+
+        results = pd.DataFrame([row for rows in fold_results for row in rows])
+        print(f"[OK] Backtest finished in {time.perf_counter() - start:.2f}s")
+        return results
+
+    @staticmethod
+    def summary(results):
+        """Test-row weighted accuracy and hit rate, plus total time, per strategy"""
+        if results.empty:
+            # No folds ran (history no longer than train_days)
+            return pd.DataFrame(columns=['accuracy', 'top_k_hit_rate', 'test_rows', 'seconds'],
+                                index=pd.Index([], name='strategy'))
+        weighted = results.assign(
+            hits=results['accuracy'] * results['test_rows'],
+            top_k_hits=results['top_k_hit_rate'] * results['test_rows']
+        ).groupby('strategy')[['hits', 'top_k_hits', 'test_rows', 'seconds']].sum()
+        return pd.DataFrame({
+            'accuracy': weighted['hits'] / weighted['test_rows'],
+            'top_k_hit_rate': weighted['top_k_hits'] / weighted['test_rows'],
+            'test_rows': weighted['test_rows'],
+            'seconds': weighted['seconds']
+        })
+
+def main():
+    print("[INFO] Running walk-forward backtest...")
+    store = HistoryStore()
+    if len(store) == 0:
+        print("[ERROR] History store is empty, run matka_predictor.py first")
+        return
+
+    # Leave at least one test period after the training window; a 365-day store trains on 335
+    test_days = 30
+    train_days = min(365, len(store) - test_days)
+    if train_days < MIN_TRAIN_DAYS:
+        print(f"[ERROR] Need more than {MIN_TRAIN_DAYS + test_days} days of history, the store holds {len(store)}")
+        return
+
+    backtester = WalkForwardBacktester.from_store(store, train_days=train_days, test_days=test_days)
+    results = backtester.run()
+    summary = WalkForwardBacktester.summary(results)
+    print(summary.to_string())
+
+    filename = f"backtest_report_{datetime.now().strftime('%Y%m%d')}.json"
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump({
+            'generated_at': datetime.now().isoformat(),
+            'mode': backtester.mode,
+            'train_days': backtester.train_days,
+            'test_days': backtester.test_days,
+            'top_k': backtester.top_k,
+            'summary': summary.reset_index().to_dict(orient='records'),
+            'folds': results.to_dict(orient='records')
+        }, f, indent=2)
+
+    print(f"[OK] Backtest report saved to {filename}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+"""
+Benchmark suite for the predictor and analyzer hot paths
+
+    python benchmarks.py                                  # every benchmark, 30 days to 20 years
+    python benchmarks.py --sizes 30 365 --only analyze    # a quick subset
+    python benchmarks.py --compare benchmark_abc1234.json # flag regressions against a baseline
+
+Each benchmark is timed over a few runs (best run kept), then run once more
+under tracemalloc for its peak Python/NumPy allocation. The forests allocate
+their trees outside tracemalloc's view, so the process's peak RSS is recorded
+too. Results are saved as JSON named after the current commit, so runs from
+two commits can be compared.
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from matka_predictor import KalyanMatkaPredictor, generate_history
+from data_utils import NumberAnalyzer
+from transition_model import TransitionModel
+from exporters import EXTENSIONS, export_rows
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# History sizes, in days, from one month to twenty years
+HISTORY_SIZES = (30, 365, 1825, 3650, 7300)
+
+# Relative slowdown (or memory growth) beyond which a benchmark counts as a regression
+DEFAULT_THRESHOLD = 0.25
+# Absolute changes below these are timer/allocator noise, never regressions
+NOISE_FLOOR = {'seconds': 0.002, 'peak_bytes': 64 * 1024}
+
+# Benchmarks that fit the forests. Pana forests keep a 220-class probability
+# table in every tree node, so they are the memory peak (about 2.4 GB RSS at
+# 20 years); --max-train-days can cap them on smaller machines, and the cases
+# it skips are recorded as skipped so compare() reports them.
+TRAINING_BENCHMARKS = ('train_prediction_model', 'generate_prediction', 'compile_models', 'predict_range')
+MAX_TRAIN_DAYS = None
+
+def legacy_frame(data):
+    """The pre-compact layout: string 'date' column and int64 numbers"""
+    legacy = data.reset_index()
+    legacy['date'] = legacy['date'].dt.strftime('%Y-%m-%d')
+    for column in legacy.columns:
+        if column != 'date':
+            legacy[column] = legacy[column].to_numpy().astype(np.int64)
+    return legacy
+
+def memory_report(sizes=HISTORY_SIZES):
+    """Deep memory usage of a history frame in the legacy and compact layouts"""
+    report = []
+    for days in sizes:
+        compact = generate_history(days, rng=days)
+        before = int(legacy_frame(compact).memory_usage(deep=True).sum())
+        after = int(compact.memory_usage(deep=True).sum())
+        report.append({
+            'days': days,
+            'legacy_bytes': before,
+            'compact_bytes': after,
+            'ratio': before / after
+        })
+    return report
+
+def cases(days):
+    """
+    (name, setup, run, repeat) for every benchmark at one history size
+    `setup` runs untimed before each run; it clears the predictor's caches
+    where the benchmark should measure a cold computation.
+    """
+    predictor = KalyanMatkaPredictor()
+    analyzer = NumberAnalyzer()
+    data = generate_history(days, rng=days)
+    numbers = data['jodi'].to_numpy()
+    transitions = TransitionModel.from_frame(data)
+
+    def load():
+        predictor.data = data
+
+    def cold_stats():
+        load()
+        # Drop every cached layer above the frame, or analyze_patterns reuses the snapshot
+        predictor.stats = predictor.stats_data = None
+        predictor.snapshot = predictor.snapshot_data = None
+        predictor.reports.clear()
+
+    def cold_hot_cold():
+        load()
+        predictor.hot_cold = predictor.hot_cold_data = None
+
+    def trained():
+        if getattr(predictor, 'jodi_model', None) is None:
+            load()
+            predictor.train_prediction_model(workers=1)
+
+    return [
+        ('scrape_historical_data', None, lambda: predictor.scrape_historical_data(days, rng=days), 5),
+        ('analyze_patterns', cold_stats, predictor.analyze_patterns, 5),
+        ('train_prediction_model', load, lambda: predictor.train_prediction_model(workers=1), 1),
+        ('generate_prediction', trained, predictor.generate_prediction, 3),
+        ('compile_models', trained, predictor.compile_models, 3),
+        ('predict_range', trained, lambda: predictor.predict_range('2026-01-01', '2026-12-31'), 5),
+        ('get_hot_cold_numbers', cold_hot_cold, predictor.get_hot_cold_numbers, 5),
+        ('transition_model_build', None, lambda: TransitionModel.from_frame(data, window=days), 5),
+        ('markov_candidates', None, lambda: transitions.candidates(5), 5),
+        ('calculate_win_probability', load, lambda: [predictor.calculate_win_probability(n) for n in range(10, 100)], 5),
+        ('calculate_number_frequency', None, lambda: analyzer.calculate_number_frequency(data), 5),
+        ('find_patterns', None, lambda: analyzer.find_patterns(data), 5),
+        ('find_consecutive_patterns', None, lambda: analyzer.find_consecutive_patterns(numbers), 5),
+        ('analyze_sum_patterns', None, lambda: analyzer.analyze_sum_patterns(numbers), 5),
+        ('analyze_even_odd_patterns', None, lambda: analyzer.analyze_even_odd_patterns(numbers), 5)
+    ] + [
+        # Each run overwrites the same file in the temp folder
+        (f'export_{fmt}', None, lambda fmt=fmt: export_rows(
+            data, os.path.join(tempfile.gettempdir(), f'matka_benchmark{EXTENSIONS[fmt]}'), fmt=fmt), 3)
+        for fmt in EXTENSIONS
+    ]
+
+def measure(setup, run, repeat):
+    """Best wall time over `repeat` runs, then peak traced memory of one more run"""
+    times = []
+    # The code under test prints progress; keep it out of the benchmark output
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            if setup:
+                setup()
+            start = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - start)
+
+        if setup:
+            setup()
+        tracemalloc.start()
+        try:
+            run()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return {'seconds': min(times), 'mean_seconds': sum(times) / len(times), 'peak_bytes': peak,
+            'max_rss_bytes': max_rss()}
+
+def max_rss():
+    """Peak resident memory of this process so far, or None where unsupported"""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == 'darwin' else rss * 1024  # bytes on macOS, KiB on Linux
+
+def run_benchmarks(sizes=HISTORY_SIZES, only=None, max_train_days=MAX_TRAIN_DAYS):
+    """Every benchmark (or those whose name contains one of `only`) at every size"""
+    results = []
+    for days in sizes:
+        for name, setup, run, repeat in cases(days):
+            if only and not any(part in name for part in only):
+                continue
+            if name in TRAINING_BENCHMARKS and max_train_days is not None and days > max_train_days:
+                reason = f"above --max-train-days {max_train_days}"
+                print(f"{name:>28} {days:>6} days: skipped ({reason})")
+                results.append({'benchmark': name, 'days': days, 'skipped': reason})
+                continue
+            result = {'benchmark': name, 'days': days, **measure(setup, run, repeat)}
+            print(f"{name:>28} {days:>6} days: {result['seconds'] * 1000:10.2f} ms "
+                  f"{result['peak_bytes'] / 1024:10.1f} KiB peak")
+            results.append(result)
+    return results
+
+def current_commit():
+    """Short hash of the checked-out commit, or None outside a git checkout"""
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True)
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """
+    Benchmarks slower or hungrier than the baseline by more than `threshold`
+    Both arguments are result documents as saved by main(); only benchmark and
+    size pairs present in both are compared, and changes inside NOISE_FLOOR
+    are ignored. A case measured in the baseline but skipped now is reported
+    with metric 'skipped'.
+    """
+    previous = {(row['benchmark'], row['days']): row for row in baseline['results']}
+    regressions = []
+    for row in current['results']:
+        old = previous.get((row['benchmark'], row['days']))
+        if old is None or 'skipped' in old:
+            continue
+        if 'skipped' in row:
+            regressions.append({'benchmark': row['benchmark'], 'days': row['days'], 'metric': 'skipped',
+                                'baseline': None, 'current': None, 'change': None})
+            continue
+        for metric, floor in NOISE_FLOOR.items():
+            if row[metric] > old[metric] * (1 + threshold) and row[metric] - old[metric] > floor:
+                regressions.append({
+                    'benchmark': row['benchmark'],
+                    'days': row['days'],
+                    'metric': metric,
+                    'baseline': old[metric],
+                    'current': row[metric],
+                    'change': row[metric] / old[metric] - 1 if old[metric] else float('inf')
+                })
+    return regressions
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Benchmark the prediction and analysis hot paths")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(HISTORY_SIZES), help="history sizes in days")
+    parser.add_argument('--only', nargs='+', default=None, help="benchmark name filters")
+    parser.add_argument('--max-train-days', type=int, default=MAX_TRAIN_DAYS,
+                        help="largest history to train forests on (default: every size)")
+    parser.add_argument('--output', default=None, help="results file (default: benchmark_<commit>.json)")
+    parser.add_argument('--compare', default=None, help="baseline results file to check for regressions")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help="allowed relative slowdown")
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    print("[INFO] Running benchmarks...")
+    commit = current_commit()
+    document = {
+        'generated_at': datetime.now().isoformat(),
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'results': run_benchmarks(args.sizes, args.only, args.max_train_days),
+        'memory': memory_report(args.sizes)
+    }
+
+    print("[INFO] History frame memory (legacy -> compact layout):")
+    for row in document['memory']:
+        print(f"{row['days']:>6} days: {row['legacy_bytes']:>10,} -> {row['compact_bytes']:>9,} bytes "
+              f"({row['ratio']:.1f}x smaller)")
+
+    filename = args.output or f"benchmark_{commit or datetime.now().strftime('%Y%m%d_%H%M')}.json"
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump(document, f, indent=2)
+    print(f"[OK] Benchmark results saved to {filename}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, document, args.threshold)
+        for row in regressions:
+            if row['metric'] == 'skipped':
+                print(f"[WARNING] {row['benchmark']} at {row['days']} days: measured in the baseline, skipped now")
+                continue
+            print(f"[WARNING] {row['benchmark']} at {row['days']} days: {row['metric']} "
+                  f"{row['baseline']:.4g} -> {row['current']:.4g} ({row['change']:+.0%})")
+        if regressions:
+            print(f"[ERROR] {len(regressions)} regressions beyond {args.threshold:.0%} against {args.compare}")
+            return 1
+        print(f"[OK] No regressions beyond {args.threshold:.0%} against {args.compare}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
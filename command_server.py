@@ -0,0 +1,161 @@
+"""
+Interactive Telegram commands answered from in-memory state
+
+    /today [market]          latest daily report
+    /hot [market]            hot and cold jodis over 7, 30 and 90 days
+    /prob <number> [market]  historical frequency of a jodi or pana
+    /history <days> [market] recent draws (up to 90 days)
+
+Every scheduled job publishes a ServingState per market; commands only read
+the newest state, so a request never retrains, reloads or rescans history.
+"""
+from datetime import datetime
+import numpy as np
+from telegram.ext import Application, CommandHandler
+from history_store import frame_dates
+
+# Most draws kept for /history
+MAX_HISTORY_DAYS = 90
+
+class ServingState:
+    """Everything the commands answer from, for one market at one point in time"""
+    def __init__(self, market, report, prediction, hot_cold, counts, total, recent, published_at=None):
+        self.market = market
+        self.report = report
+        self.prediction = prediction
+        self.hot_cold = hot_cold
+        self.counts = counts
+        self.total = total
+        self.recent = recent
+        self.published_at = published_at or datetime.now()
+
+    @classmethod
+    def from_predictor(cls, predictor, report):
+        """Copy what the commands need out of a predictor that just produced `report`"""
+        stats = predictor.get_stats()
+        data = predictor.data.sort_values('date', kind='stable').tail(MAX_HISTORY_DAYS)
+        dates = np.datetime_as_string(frame_dates(data), unit='D')
+        recent = [
+            f"{date}: {open_pana:03d}-{jodi:02d}-{close_pana:03d}"
+            for date, open_pana, jodi, close_pana in zip(
+                dates, data['open_pana'].tolist(), data['jodi'].tolist(), data['close_pana'].tolist())
+        ]
+        return cls(
+            market=predictor.market,
+            report=report,
+            prediction=predictor.last_prediction,
+            hot_cold=predictor.get_hot_cold().summary(),
+            counts={category: counts.copy() for category, counts in stats.counts.items()},
+            total=stats.total,
+            recent=recent[::-1]  # Newest first
+        )
+
+class CommandServer:
+    """
+    Bot command handlers over the latest published ServingState per market
+    respond() is a plain function of the command text, so it can be tested
+    without Telegram; build_application() wires it to a telegram.ext
+    Application.
+    """
+    COMMANDS = ('start', 'help', 'today', 'hot', 'prob', 'history')
+
+    def __init__(self, default_market=None):
+        self.default_market = default_market
+        self.states = {}
+
+    def publish(self, state):
+        """Make `state` the one its market's commands answer from"""
+        # Replacing the dict entry is atomic, so readers never see a half-built state
+        self.states[state.market.lower()] = state
+        if self.default_market is None:
+            self.default_market = state.market
+
+    def _state(self, market_words):
+        name = ' '.join(market_words) or self.default_market
+        state = self.states.get((name or '').lower())
+        if state is None:
+            known = ', '.join(state.market for state in self.states.values()) or 'none yet'
+            return None, f"No prediction for {name or 'any market'} yet (available: {known})"
+        return state, None
+
+    def _today(self, args):
+        state, error = self._state(args)
+        if error:
+            return error
+        if state.published_at.date() != datetime.now().date():
+            return f"{state.report.strip()}\n\n(Published {state.published_at:%Y-%m-%d %H:%M}; today's run is pending)"
+        return state.report.strip()
+
+    def _hot(self, args):
+        state, error = self._state(args)
+        if error:
+            return error
+        lines = [f"{state.market} hot/cold jodis"]
+        for window, summary in state.hot_cold.items():
+            lines.append(f"{window} days - hot: {', '.join(map(str, summary['hot_numbers']))}"
+                         f" | cold: {', '.join(map(str, summary['cold_numbers']))}")
+        return '\n'.join(lines)
+
+    def _prob(self, args):
+        if not args or not args[0].isdigit() or len(args[0]) not in (2, 3):
+            return "Usage: /prob <2-digit jodi or 3-digit pana> [market]"
+        state, error = self._state(args[1:])
+        if error:
+            return error
+        number = int(args[0])
+        categories = ('jodi',) if len(args[0]) == 2 else ('open_pana', 'close_pana')
+        lines = []
+        for category in categories:
+            count = int(state.counts[category][number])
+            probability = count / state.total * 100 if state.total else 0
+            lines.append(f"{args[0]} as {category}: {count} of {state.total} draws ({probability:.2f}%)")
+        return '\n'.join(lines)
+
+    def _history(self, args):
+        if not args or not args[0].isdigit():
+            return f"Usage: /history <days, up to {MAX_HISTORY_DAYS}> [market]"
+        state, error = self._state(args[1:])
+        if error:
+            return error
+        days = max(1, min(int(args[0]), MAX_HISTORY_DAYS))
+        return '\n'.join([f"{state.market} last {days} draws"] + state.recent[:days])
+
+    def _help(self, args):
+        markets = ', '.join(state.market for state in self.states.values()) or 'none yet'
+        return (
+            "/today [market] - latest prediction report\n"
+            "/hot [market] - hot and cold jodis\n"
+            "/prob <number> [market] - historical frequency\n"
+            "/history <days> [market] - recent draws\n"
+            f"Markets: {markets}"
+        )
+
+    def respond(self, command, args=()):
+        """Reply text for one command and its arguments"""
+        handler = {
+            'start': self._help,
+            'help': self._help,
+            'today': self._today,
+            'hot': self._hot,
+            'prob': self._prob,
+            'history': self._history
+        }.get(command)
+        if handler is None:
+            return f"Unknown command /{command}\n\n" + self._help(())
+        return handler(list(args))
+
+    def respond_text(self, text):
+        """Reply text for a raw message such as '/prob 45 Kalyan'"""
+        command, *args = text.split()
+        return self.respond(command.lstrip('/').split('@')[0].lower(), args)
+
+    async def handle(self, update, context):
+        """telegram.ext callback shared by every command"""
+        message = update.effective_message
+        await message.reply_text(self.respond_text(message.text))
+
+    def build_application(self, token):
+        """An Application serving every command, handling updates concurrently"""
+        application = Application.builder().token(token).concurrent_updates(True).build()
+        application.add_handler(CommandHandler(list(self.COMMANDS), self.handle))
+        return application
@@ -0,0 +1,173 @@
+import numpy as np
+
+# Samples per traversal chunk, bounding the (trees x samples) work arrays
+CHUNK_ROWS = 4096
+
+class CompiledForest:
+    """
+    A fitted RandomForestClassifier flattened into NumPy node arrays
+    Every tree's nodes are concatenated: feature, threshold and child indices
+    per node, with leaves pointing at themselves so all trees and samples
+    descend together for max_depth vectorized steps. Leaf class distributions
+    are kept sparse (most leaves hold one or two classes), which is what makes
+    the compiled model a fraction of the pickled forest's size.
+
+    Probabilities are sklearn's own leaf fractions, summed tree by tree in the
+    forest's order and divided by the tree count, so predict() returns exactly
+    what model.predict() does. With build_table(), every feature combination in
+    a small integer domain is predicted up front and lookups skip the trees.
+    """
+    def __init__(self, classes, roots, feature, threshold, left, right, max_depth,
+                 leaf_row, leaf_offsets, leaf_classes, leaf_values, table=None, table_low=None):
+        self.classes = classes
+        self.roots = roots
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.max_depth = int(max_depth)
+        self.leaf_row = leaf_row
+        self.leaf_offsets = leaf_offsets
+        self.leaf_classes = leaf_classes
+        self.leaf_values = leaf_values
+        self.table = table
+        self.table_low = table_low
+
+    @classmethod
+    def from_sklearn(cls, model):
+        """Compile a fitted single-output RandomForestClassifier"""
+        trees = [estimator.tree_ for estimator in model.estimators_]
+        sizes = np.array([tree.node_count for tree in trees])
+        starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+
+        feature, threshold, left, right, leaf_row = [], [], [], [], []
+        leaf_offsets, leaf_classes, leaf_values = [np.zeros(1, dtype=np.int64)], [], []
+        leaves = 0
+        for tree, start in zip(trees, starts):
+            nodes = np.arange(tree.node_count)
+            is_leaf = tree.children_left == -1
+            # Leaves loop back to themselves, so extra descent steps are no-ops
+            feature.append(np.where(is_leaf, 0, tree.feature))
+            threshold.append(np.where(is_leaf, np.inf, tree.threshold))
+            left.append(np.where(is_leaf, nodes, tree.children_left) + start)
+            right.append(np.where(is_leaf, nodes, tree.children_right) + start)
+            rows = np.full(tree.node_count, -1, dtype=np.int64)
+            rows[is_leaf] = np.arange(leaves, leaves + is_leaf.sum())
+            leaf_row.append(rows)
+            leaves += int(is_leaf.sum())
+
+            values = tree.value[is_leaf, 0, :]
+            # sklearn < 1.4 stores (weighted) class counts and predict_proba divides each
+            # row by its sum; newer versions store those fractions, with sums already ~1
+            sums = values.sum(axis=1, keepdims=True)
+            if not np.allclose(sums, 1, rtol=0, atol=1e-9):
+                sums[sums == 0.0] = 1.0
+                values = values / sums
+            leaf, class_index = np.nonzero(values)
+            leaf_classes.append(class_index)
+            leaf_values.append(values[leaf, class_index])
+            leaf_offsets.append(np.cumsum(np.bincount(leaf, minlength=len(values))) + leaf_offsets[-1][-1])
+
+        index_type = np.int32 if sizes.sum() < 2 ** 31 else np.int64
+        return cls(
+            classes=np.asarray(model.classes_),
+            roots=starts.astype(index_type),
+            feature=np.concatenate(feature).astype(np.int16),
+            threshold=np.concatenate(threshold).astype(np.float64),
+            left=np.concatenate(left).astype(index_type),
+            right=np.concatenate(right).astype(index_type),
+            max_depth=max(tree.max_depth for tree in trees),
+            leaf_row=np.concatenate(leaf_row).astype(index_type),
+            leaf_offsets=np.concatenate(leaf_offsets).astype(np.int64),
+            leaf_classes=np.concatenate(leaf_classes).astype(np.int16 if len(model.classes_) < 2 ** 15 else np.int32),
+            leaf_values=np.concatenate(leaf_values).astype(np.float64)
+        )
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    def apply(self, X):
+        """Leaf row reached by every sample in every tree, shape (trees, samples)"""
+        # sklearn compares float32 features against float64 thresholds; do the same
+        X = np.asarray(X, dtype=np.float32)
+        samples = np.arange(len(X))
+        nodes = np.repeat(self.roots[:, None], len(X), axis=1)
+        for _ in range(self.max_depth):
+            go_left = X[samples, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return self.leaf_row[nodes]
+
+    def predict_proba(self, X):
+        """Class probabilities in classes order, identical to the forest's predict_proba"""
+        X = np.asarray(X, dtype=np.float32)
+        n_classes = len(self.classes)
+        proba = np.empty((len(X), n_classes))
+        for chunk in range(0, len(X), CHUNK_ROWS):
+            block = X[chunk:chunk + CHUNK_ROWS]
+            leaves = self.apply(block).ravel()  # Tree-major, the order sklearn adds trees in
+            starts = self.leaf_offsets[leaves]
+            counts = self.leaf_offsets[leaves + 1] - starts
+            entries = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+            samples = np.repeat(np.tile(np.arange(len(block)), self.n_trees), counts)
+            # bincount adds in input order: per cell, one tree after another, as sklearn's running sum does
+            proba[chunk:chunk + len(block)] = np.bincount(
+                samples * n_classes + self.leaf_classes[entries],
+                weights=self.leaf_values[entries], minlength=len(block) * n_classes
+            ).reshape(len(block), n_classes)
+        proba /= self.n_trees
+        return proba
+
+    def _predict_trees(self, X):
+        return self.classes.take(np.argmax(self.predict_proba(X), axis=1))
+
+    def build_table(self, domain):
+        """
+        Precompute predictions for every integer feature combination
+        `domain` holds one inclusive (low, high) range per feature, e.g. the
+        calendar's ((0, 6), (1, 31), (1, 12)). Returns self.
+        """
+        low = np.array([bounds[0] for bounds in domain], dtype=np.int64)
+        shape = tuple(int(high - lo + 1) for lo, (_, high) in zip(low, domain))
+        grid = np.indices(shape).reshape(len(shape), -1).T + low
+        self.table = self._predict_trees(grid).reshape(shape)
+        self.table_low = low
+        return self
+
+    def predict(self, X):
+        """Predicted classes; a table lookup when every row falls inside the table's domain"""
+        X = np.asarray(X)
+        if self.table is not None and len(X):
+            index = X.astype(np.int64) - self.table_low
+            integral = X.dtype.kind in 'iub' or (index == X - self.table_low).all()
+            if integral and (index >= 0).all() and (index < self.table.shape).all():
+                return self.table[tuple(index.T)]
+        return self._predict_trees(X)
+
+    def predict_one(self, *features):
+        """Prediction for one sample given as separate feature values"""
+        if self.table is not None:
+            index = tuple(int(value) - int(low) for value, low in zip(features, self.table_low))
+            inside = all(0 <= i < size for i, size in zip(index, self.table.shape))
+            if inside and all(value == int(value) for value in features):
+                return self.table[index]
+        return self._predict_trees(np.array([features]))[0]
+
+    def save(self, path):
+        """Write the compiled arrays (and table) to a compressed .npz file"""
+        arrays = {
+            name: getattr(self, name) for name in (
+                'classes', 'roots', 'feature', 'threshold', 'left', 'right',
+                'leaf_row', 'leaf_offsets', 'leaf_classes', 'leaf_values')
+        }
+        if self.table is not None:
+            arrays.update(table=self.table, table_low=self.table_low)
+        with open(path, 'wb') as f:
+            np.savez_compressed(f, max_depth=self.max_depth, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as arrays:
+            fields = {name: arrays[name] for name in arrays.files}
+        fields['max_depth'] = int(fields['max_depth'])
+        return cls(**fields)
@@ -1,73 +1,328 @@
 import json
 import csv
+import os
+import re
+import threading
+import time
 from datetime import datetime, timedelta
+from urllib import robotparser
+from urllib.parse import urlsplit
 import pandas as pd
 import numpy as np
-from matka_predictor import KalyanMatkaPredictor
+from instrumentation import instrumented, annotate
+from exporters import CHUNK_ROWS, EXTENSIONS, export_rows, write_json
 
 class DataManager:
-    def __init__(self):
+    def __init__(self, store=None, simulate=False):
+        # Deferred so NumberAnalyzer and WebScraper users don't pay for the predictor imports
+        from matka_predictor import KalyanMatkaPredictor
+        from history_store import HistoryStore
+        
         self.predictor = KalyanMatkaPredictor()
+        self.store = store if store is not None else HistoryStore()
+        # Top the store up with simulated draws before analysing it
+        self.simulate = simulate
+    
+    @instrumented('data.export')
+    def export(self, data, filename, fmt=None, chunk_rows=CHUNK_ROWS):
+        """
+        Stream rows to a CSV, NDJSON or compressed columnar file (see exporters.py)
+        `data` is a DataFrame, a list of records or an iterable of chunks; the
+        file is written in bounded-memory chunks and renamed into place when done.
+        """
+        result = export_rows(data, filename, fmt=fmt, chunk_rows=chunk_rows)
+        annotate(rows=result['rows'], format=result['format'])
+        print(f"[OK] Exported {result['rows']} rows to {filename} in {result['seconds']:.2f}s "
+              f"({result['rows_per_second']:,.0f} rows/s, {result['bytes'] / 1024:,.1f} KiB)")
+        return result
     
-    def export_to_csv(self, data, filename=None):
+    def export_to_csv(self, data, filename=None, chunk_rows=CHUNK_ROWS):
         """Export data to CSV format"""
         if filename is None:
             filename = f"matka_data_{datetime.now().strftime('%Y%m%d')}.csv"
         
-        df = pd.DataFrame(data)
-        df.to_csv(filename, index=False)
-        print(f"[OK] Data exported to {filename}")
+        self.export(data, filename, fmt='csv', chunk_rows=chunk_rows)
+        return filename
+    
+    def export_history(self, filename=None, fmt='csv', days=None, chunk_rows=CHUNK_ROWS):
+        """
+        Stream the history store (or its last `days` days) to a file
+        Only one chunk of draws is read from the store at a time.
+        """
+        if filename is None:
+            filename = f"matka_data_{datetime.now().strftime('%Y%m%d')}{EXTENSIONS[fmt]}"
+        
+        end = self.store.last_date
+        start = None if not days or end is None else end - np.timedelta64(days - 1, 'D')
+        self.export(self.store.iter_chunks(chunk_rows, start=start), filename, fmt=fmt, chunk_rows=chunk_rows)
+        return filename
+    
+    def export_predictions(self, predictions, filename=None, fmt='ndjson', chunk_rows=CHUNK_ROWS):
+        """Stream predictions (dicts from generate_prediction or a predict_range frame), one row each"""
+        if filename is None:
+            filename = f"predictions_{datetime.now().strftime('%Y%m%d')}{EXTENSIONS[fmt]}"
+        
+        self.export(predictions, filename, fmt=fmt, chunk_rows=chunk_rows)
         return filename
     
+    @instrumented('data.import_from_csv', rows=lambda added: added)
+    def import_from_csv(self, filename):
+        """Import a CSV export back into the history store"""
+        return self.store.import_csv(filename)
+    
+    @instrumented('data.export_predictions_to_json')
     def export_predictions_to_json(self, predictions, filename=None):
         """Export predictions to JSON format"""
         if filename is None:
             filename = f"predictions_{datetime.now().strftime('%Y%m%d')}.json"
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(predictions, f, indent=2, default=str)
+        write_json(filename, predictions)
         
         print(f"[OK] Predictions exported to {filename}")
         return filename
     
+    @instrumented('data.generate_analysis_report', rows=lambda report: report['total_records'])
     def generate_analysis_report(self):
-        """Generate comprehensive analysis report"""
-        self.predictor.scrape_historical_data(days=180)
-        analysis = self.predictor.analyze_patterns()
-        
+        """
+        Generate comprehensive analysis report
+        Rendered (and saved) once per history version and day; later calls
+        return the cached report.
+        """
+        self.predictor.load_history(self.store, days=180, simulate=self.simulate)
+        return self._analysis_report(self.predictor.analysis_snapshot())
+    
+    def _analysis_report(self, snapshot):
+        key = ('analysis', snapshot.version, datetime.now().strftime('%Y%m%d'))
+        return self.predictor.reports.get(key, lambda: self._render_analysis_report(snapshot))
+    
+    def _render_analysis_report(self, snapshot):
+        analysis = snapshot.analysis
         report = {
             'generated_at': datetime.now().isoformat(),
             'data_period': '180 days',
-            'total_records': len(self.predictor.data),
+            'total_records': snapshot.total_records,
             'most_frequent_jodis': analysis['most_frequent_jodis'].to_dict(),
             'day_wise_patterns': analysis['day_wise_patterns'].to_dict(),
             'monthly_patterns': analysis['monthly_patterns'].to_dict(),
-            'statistics': {
-                'jodi_mean': float(self.predictor.data['jodi'].mean()),
-                'jodi_std': float(self.predictor.data['jodi'].std()),
-                'open_pana_mean': float(self.predictor.data['open_pana'].mean()),
-                'close_pana_mean': float(self.predictor.data['close_pana'].mean())
-            }
+            'statistics': snapshot.statistics
         }
         
         # Save report
         filename = f"analysis_report_{datetime.now().strftime('%Y%m%d')}.json"
-        with open(filename, 'w') as f:
-            json.dump(report, f, indent=2)
+        write_json(filename, report)
         
         print(f"[INFO] Analysis report saved to {filename}")
         return report
+    
+    @instrumented('data.generate_comprehensive_report')
+    def generate_comprehensive_report(self):
+        """
+        Analysis report plus number patterns, from the same analysis snapshot
+        Uses the history already loaded (loading it only on a first call), and
+        is rendered (and saved) once per history version and day.
+        """
+        if len(self.predictor.data) == 0:
+            self.predictor.load_history(self.store, days=180, simulate=self.simulate)
+        snapshot = self.predictor.analysis_snapshot()
+        report = self._analysis_report(snapshot)
+        key = ('comprehensive', snapshot.version, datetime.now().strftime('%Y%m%d'))
+        return self.predictor.reports.get(key, lambda: self._render_comprehensive_report(report, snapshot))
+    
+    def _render_comprehensive_report(self, report, snapshot):
+        comprehensive_report = {
+            'analysis': report,
+            'patterns': snapshot.patterns,
+            'export_timestamp': datetime.now().isoformat()
+        }
+        
+        filename = f"comprehensive_report_{datetime.now().strftime('%Y%m%d')}.json"
+        write_json(filename, comprehensive_report)
+        
+        print(f"[OK] Comprehensive report saved to {filename}")
+        return comprehensive_report
+
+class RateLimiter:
+    """Minimum interval between requests to the same host, shared across threads"""
+    def __init__(self, min_interval=1.0):
+        self.min_interval = min_interval
+        self.next_allowed = {}
+        self.lock = threading.Lock()
+    
+    def wait(self, host):
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_allowed.get(host, now))
+            self.next_allowed[host] = start + self.min_interval
+        if start > now:
+            time.sleep(start - now)
+
+# One result row: a date followed (within the same row) by open pana - jodi - close pana,
+# e.g. "05/08/2025 ... 123-64-578"
+DATE_PATTERN = r'(?P<date>\d{4}-\d{2}-\d{2}|\d{2}[/-]\d{2}[/-]\d{4})'
+RESULT_PATTERN = re.compile(
+    DATE_PATTERN + r'(?:(?!\d{4}-\d{2}-\d{2}|\d{2}[/-]\d{2}[/-]\d{4}).){0,300}?'
+    r'(?<!\d)(?P<open>\d{3})\s*-\s*(?P<jodi>\d{2})\s*-\s*(?P<close>\d{3})(?!\d)',
+    re.DOTALL
+)
 
 class WebScraper:
     """
-    Template for web scraping functionality
-    Note: This is a template - actual implementation would need
-    to comply with website terms of service and robots.txt
+    Streaming result ingestion from matka result pages
+    Note: actual scraping must comply with website terms of service and robots.txt,
+    which is checked before every host's first request.
+    
+    Requests go through one pooled session with a per-host rate limit, and
+    ETag/Last-Modified validators are remembered so unchanged pages cost a 304.
     """
-    def __init__(self):
+    def __init__(self, rate_limit=1.0, cache_file='http_cache.json', timeout=10, respect_robots=True):
+        # requests is only needed once something is actually fetched
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        retry = Retry(total=3, backoff_factor=1, status_forcelist=(429, 500, 502, 503, 504),
+                      allowed_methods=('GET',), respect_retry_after_header=True)
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=8, max_retries=retry)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
+        self.limiter = RateLimiter(rate_limit)
+        self.timeout = timeout
+        self.respect_robots = respect_robots
+        self.robots = {}
+        self.cache_file = cache_file
+        self.validators = {}
+        # Validators of pages being read, saved by commit() once their rows are stored
+        self.pending = {}
+        if cache_file and os.path.exists(cache_file):
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                self.validators = json.load(f)
+    
+    def commit(self, url):
+        """
+        Keep the validators of the page last fetched from `url` for the next
+        conditional request; call once everything needed from it is stored
+        """
+        validators = self.pending.pop(url, None)
+        if validators is None:
+            return
+        self.validators[url] = validators
+        if not self.cache_file:
+            return
+        tmp_file = self.cache_file + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.validators, f, indent=2)
+        os.replace(tmp_file, self.cache_file)
+    
+    def allowed(self, url):
+        """Check robots.txt for the url's host (fetched once per host)"""
+        if not self.respect_robots:
+            return True
+        parts = urlsplit(url)
+        host = f"{parts.scheme}://{parts.netloc}"
+        if host not in self.robots:
+            parser = robotparser.RobotFileParser()
+            self.limiter.wait(parts.netloc)
+            response = self.session.get(host + '/robots.txt', timeout=self.timeout)
+            parser.parse(response.text.splitlines() if response.status_code == 200 else [])
+            self.robots[host] = parser
+        return self.robots[host].can_fetch(self.headers['User-Agent'], url)
+    
+    def fetch_lines(self, url):
+        """
+        Stream a page line by line
+        Yields nothing if the server reports the page unchanged (304). The
+        page's ETag/Last-Modified are only saved by commit(url), so a reader
+        that stops early or fails is sent the whole page again next time.
+        """
+        if not self.allowed(url):
+            print(f"[WARNING] robots.txt disallows {url}, skipping")
+            return
+        
+        headers = {}
+        cached = self.validators.get(url, {})
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+        
+        self.pending.pop(url, None)
+        self.limiter.wait(urlsplit(url).netloc)
+        with self.session.get(url, headers=headers, timeout=self.timeout, stream=True) as response:
+            if response.status_code == 304:
+                print(f"[INFO] {url} not modified since last fetch")
+                return
+            response.raise_for_status()
+            response.encoding = response.encoding or 'utf-8'
+            self.pending[url] = {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified')
+            }
+            yield from response.iter_lines(decode_unicode=True)
+    
+    @staticmethod
+    def parse_rows(lines):
+        """Incrementally parse result rows from a stream of text lines"""
+        buffer = ''
+        for line in lines:
+            buffer += line + '\n'
+            end = 0
+            for match in RESULT_PATTERN.finditer(buffer):
+                date_text = match.group('date')
+                fmt = '%Y-%m-%d' if date_text[4] == '-' else '%d/%m/%Y' if '/' in date_text else '%d-%m-%Y'
+                date = datetime.strptime(date_text, fmt)
+                yield {
+                    'date': date.strftime('%Y-%m-%d'),
+                    'open_pana': int(match.group('open')),
+                    'close_pana': int(match.group('close')),
+                    'jodi': int(match.group('jodi')),
+                    'day_of_week': date.weekday(),
+                    'day_of_month': date.day,
+                    'month': date.month
+                }
+                end = match.end()
+            # Keep only text that may still start a row split across lines
+            buffer = buffer[end:][-2000:]
+    
+    def stream_results(self, url, since=None, newest_first=True):
+        """
+        Yield result rows dated after `since` (YYYY-MM-DD) as the page arrives
+        On newest-first pages the download stops at the first already-known draw.
+        """
+        for row in self.parse_rows(self.fetch_lines(url)):
+            if since is not None and row['date'] <= since:
+                if newest_first:
+                    return
+                continue
+            yield row
+    
+    @instrumented('scraper.ingest', rows=lambda added: added)
+    def ingest(self, url, store, newest_first=True, batch_size=500):
+        """
+        Append the draws newer than the store's last date
+        Oldest-first pages are appended in batches as they stream in; newest-first
+        pages are collected (only the new draws) and appended once in date order.
+        """
+        since = str(store.last_date) if len(store) else None
+        added = 0
+        batch = []
+        for row in self.stream_results(url, since=since, newest_first=newest_first):
+            batch.append(row)
+            if not newest_first and len(batch) >= batch_size:
+                added += store.append(pd.DataFrame(batch))
+                batch = []
+        if batch:
+            added += store.append(pd.DataFrame(batch))
+        # Every new draw is stored (on newest-first pages the rest was known already)
+        self.commit(url)
+        
+        print(f"[OK] Ingested {added} new draws from {url}")
+        return added
     
     def scrape_website_template(self, url):
         """
@@ -77,14 +332,7 @@ class WebScraper:
         print("[WARNING] This is a template function for educational purposes")
         print("[WARNING] Actual web scraping must comply with website terms")
         
-        # Template implementation
-        # In real implementation, you would:
-        # 1. Check robots.txt
-        # 2. Respect rate limits
-        # 3. Handle errors gracefully
-        # 4. Parse HTML properly
-        
-        return []
+        return list(self.stream_results(url))
 
 class NumberAnalyzer:
     def __init__(self):
@@ -105,81 +353,73 @@ class NumberAnalyzer:
     
     def find_patterns(self, data):
         """Find various patterns in the data"""
+        # Read the jodi column once and share it between every detector
+        numbers = data['jodi'].to_numpy()
+        
         patterns = {}
         
         # Consecutive number patterns
-        patterns['consecutive_jodis'] = self.find_consecutive_patterns(data['jodi'])
+        patterns['consecutive_jodis'] = self.find_consecutive_patterns(numbers)
         
         # Sum digit patterns
-        patterns['sum_patterns'] = self.analyze_sum_patterns(data['jodi'])
+        patterns['sum_patterns'] = self.analyze_sum_patterns(numbers)
         
         # Even/Odd patterns
-        patterns['even_odd'] = self.analyze_even_odd_patterns(data['jodi'])
+        patterns['even_odd'] = self.analyze_even_odd_patterns(numbers)
         
         return patterns
     
     def find_consecutive_patterns(self, numbers):
         """Find consecutive number patterns"""
-        consecutive = []
-        for i in range(len(numbers) - 1):
-            if abs(numbers.iloc[i] - numbers.iloc[i + 1]) == 1:
-                consecutive.append((numbers.iloc[i], numbers.iloc[i + 1]))
+        values = np.asarray(numbers).astype(np.int64)
+        adjacent = np.flatnonzero(np.abs(np.diff(values)) == 1)[:10]
         
-        return consecutive[:10]  # Return top 10
+        # Plain ints, so reports serialize them as numbers
+        return [(int(values[i]), int(values[i + 1])) for i in adjacent]  # Return top 10
     
     def analyze_sum_patterns(self, numbers):
         """Analyze digit sum patterns"""
-        sums = []
-        for num in numbers:
-            digit_sum = sum(int(digit) for digit in str(num))
-            sums.append(digit_sum)
+        values = np.asarray(numbers).astype(np.int64)
+        sums = np.zeros(len(values), dtype=np.int64)
+        remaining = values
+        while remaining.any():
+            sums += remaining % 10
+            remaining = remaining // 10
         
         sum_freq = pd.Series(sums).value_counts()
         return sum_freq.head(10).to_dict()
     
     def analyze_even_odd_patterns(self, numbers):
         """Analyze even/odd number patterns"""
-        even_count = sum(1 for num in numbers if num % 2 == 0)
-        odd_count = len(numbers) - even_count
+        values = np.asarray(numbers).astype(np.int64)
+        even_count = int(np.count_nonzero((values & 1) == 0))
+        odd_count = len(values) - even_count
         
         return {
             'even_count': even_count,
             'odd_count': odd_count,
-            'even_percentage': (even_count / len(numbers)) * 100,
-            'odd_percentage': (odd_count / len(numbers)) * 100
+            'even_percentage': (even_count / len(values)) * 100,
+            'odd_percentage': (odd_count / len(values)) * 100
         }
 
-def main():
+def main(simulate=True):
     print("[INFO] Running Data Management and Analysis Tools...")
     
     # Initialize components
-    data_manager = DataManager()
-    analyzer = NumberAnalyzer()
+    data_manager = DataManager(simulate=simulate)
     
     # Generate and export analysis
     print("[INFO] Generating analysis report...")
-    report = data_manager.generate_analysis_report()
-    
-    # Analyze patterns
-    print("[INFO] Analyzing number patterns...")
-    patterns = analyzer.find_patterns(data_manager.predictor.data)
+    data_manager.generate_analysis_report()
     
     # Export data
     print("[INFO] Exporting data...")
     data_manager.export_to_csv(data_manager.predictor.data)
     
-    # Generate comprehensive report
-    comprehensive_report = {
-        'analysis': report,
-        'patterns': patterns,
-        'export_timestamp': datetime.now().isoformat()
-    }
-    
-    filename = f"comprehensive_report_{datetime.now().strftime('%Y%m%d')}.json"
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(comprehensive_report, f, indent=2, default=str)
+    # Generate comprehensive report; number patterns come from the same analysis snapshot
+    print("[INFO] Analyzing number patterns...")
+    data_manager.generate_comprehensive_report()
     
-    print(f"[OK] Comprehensive report saved to {filename}")
     print("[COMPLETE] Data management and analysis complete!")
 
 if __name__ == "__main__":
@@ -0,0 +1,232 @@
+"""
+Streaming exporters for history frames and prediction sets
+
+    export_rows(store.iter_chunks(), 'history.csv')          # format from the extension
+    export_rows(predictions, 'predictions.ndjson')
+    export_rows(frame, 'history.zip', fmt='columnar')
+    read_columnar('history.zip', columns=['jodi'])
+
+Rows are converted and written one chunk at a time, so memory stays bounded
+by the chunk size whatever the export's length. Every file is written to a
+temporary name in the target folder and renamed into place once complete:
+a reader sees the previous file or the finished new one, never a partial one.
+
+The columnar format is a deflate-compressed ZIP holding one .npy member per
+column per chunk ('jodi/000000.npy', ...) and a schema.json, so any column
+can be read back without the others.
+"""
+import io
+import json
+import os
+import tempfile
+import time
+import zipfile
+from contextlib import contextmanager
+from datetime import date, datetime
+import numpy as np
+import pandas as pd
+
+# Rows converted and written per step
+CHUNK_ROWS = 50_000
+
+FORMATS = {'.csv': 'csv', '.ndjson': 'ndjson', '.jsonl': 'ndjson', '.zip': 'columnar'}
+EXTENSIONS = {'csv': '.csv', 'ndjson': '.ndjson', 'columnar': '.zip'}
+
+def format_for(path):
+    """Export format implied by a file name's extension"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FORMATS:
+        raise ValueError(f"Unknown export format for {path}; use one of {', '.join(FORMATS)}")
+    return FORMATS[extension]
+
+@contextmanager
+def atomic_file(path, mode='wb', **kwargs):
+    """
+    Open a temporary file next to `path` for writing; rename it over `path` on success
+    On an exception the temporary file is removed and `path` is left untouched.
+    """
+    folder, name = os.path.split(os.path.abspath(path))
+    fd, tmp_file = tempfile.mkstemp(prefix=f'.{name}.', suffix='.tmp', dir=folder)
+    try:
+        # mkstemp creates owner-only files; exports are ordinary readable files
+        os.chmod(tmp_file, 0o644)
+        with open(fd, mode, **kwargs) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, path)
+    except BaseException:
+        try:
+            os.remove(tmp_file)
+        except FileNotFoundError:
+            pass
+        raise
+
+def json_default(value):
+    """JSON encoding for NumPy, pandas and date values (instead of default=str)"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, (pd.Series, pd.Index)):
+        return value.tolist()
+    if isinstance(value, (datetime, date, pd.Timestamp)):
+        return value.isoformat()
+    return str(value)
+
+def write_json(path, document, indent=2):
+    """Write one JSON document atomically, encoding it piece by piece"""
+    with atomic_file(path, 'w', encoding='utf-8') as f:
+        json.dump(document, f, indent=indent, default=json_default)
+    return path
+
+def iter_chunks(data, chunk_rows=CHUNK_ROWS):
+    """
+    DataFrames of at most `chunk_rows` rows from a DataFrame, a record dict,
+    or an iterable of DataFrames and/or record dicts (e.g. a generator)
+    """
+    if isinstance(data, (pd.DataFrame, dict)):
+        data = [data]
+    batch = []
+    for item in data:
+        if isinstance(item, pd.DataFrame):
+            if batch:
+                yield pd.DataFrame.from_records(batch)
+                batch = []
+            # An empty frame still yields once, so its columns reach the header
+            for start in range(0, max(len(item), 1), chunk_rows):
+                yield item.iloc[start:start + chunk_rows]
+            continue
+        batch.append(item)
+        if len(batch) == chunk_rows:
+            yield pd.DataFrame.from_records(batch)
+            batch = []
+    if batch:
+        yield pd.DataFrame.from_records(batch)
+
+def _flat(chunk):
+    """A chunk with its date index as a column and nested values as JSON text"""
+    if isinstance(chunk.index, pd.DatetimeIndex):
+        chunk = chunk.reset_index()
+    nested = [
+        column for column in chunk.columns
+        if chunk[column].dtype == object and chunk[column].map(lambda value: isinstance(value, (dict, list, tuple))).any()
+    ]
+    if nested:
+        chunk = chunk.copy()
+        for column in nested:
+            chunk[column] = chunk[column].map(lambda value: json.dumps(value, default=json_default))
+    return chunk
+
+class _CsvWriter:
+    def __init__(self, f):
+        self.text = io.TextIOWrapper(f, encoding='utf-8', newline='')
+        self.header = True
+
+    def write(self, chunk):
+        _flat(chunk).to_csv(self.text, index=False, header=self.header)
+        self.header = False
+
+    def close(self):
+        self.text.flush()
+        self.text.detach()
+
+class _NdjsonWriter:
+    def __init__(self, f):
+        self.text = io.TextIOWrapper(f, encoding='utf-8', newline='\n')
+
+    def write(self, chunk):
+        if isinstance(chunk.index, pd.DatetimeIndex):
+            chunk = chunk.reset_index()
+        dates = [column for column in chunk.columns if pd.api.types.is_datetime64_any_dtype(chunk[column])]
+        if dates:
+            chunk = chunk.copy()
+            for column in dates:
+                # Plain draw dates stay plain dates
+                values = chunk[column]
+                midnight = (values.dt.normalize() == values).all()
+                chunk[column] = values.dt.strftime('%Y-%m-%d' if midnight else '%Y-%m-%dT%H:%M:%S')
+        if len(chunk):
+            # pandas' C encoder; one JSON object per line, floats at full precision
+            chunk.to_json(self.text, orient='records', lines=True, double_precision=15, default_handler=json_default)
+
+    def close(self):
+        self.text.flush()
+        self.text.detach()
+
+class _ColumnarWriter:
+    def __init__(self, f):
+        self.archive = zipfile.ZipFile(f, 'w', compression=zipfile.ZIP_DEFLATED)
+        self.columns = None
+        self.chunks = 0
+        self.rows = 0
+
+    @staticmethod
+    def _array(values):
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.astype(values.cat.categories.dtype)
+        array = values.to_numpy()
+        if array.dtype == object:
+            array = np.array([value if isinstance(value, str) else json.dumps(value, default=json_default) for value in array], dtype=str)
+        return array
+
+    def write(self, chunk):
+        chunk = _flat(chunk)
+        arrays = {str(column): self._array(chunk[column]) for column in chunk.columns}
+        if self.columns is None:
+            self.columns = {column: array.dtype.str for column, array in arrays.items()}
+        elif list(arrays) != list(self.columns):
+            raise ValueError(f"Chunk columns {list(arrays)} differ from the export's {list(self.columns)}")
+        for column, array in arrays.items():
+            with self.archive.open(f'{column}/{self.chunks:06d}.npy', 'w') as member:
+                np.lib.format.write_array(member, array, allow_pickle=False)
+        self.chunks += 1
+        self.rows += len(chunk)
+
+    def close(self):
+        schema = {'columns': self.columns or {}, 'chunks': self.chunks, 'rows': self.rows}
+        self.archive.writestr('schema.json', json.dumps(schema, indent=2))
+        self.archive.close()
+
+WRITERS = {'csv': _CsvWriter, 'ndjson': _NdjsonWriter, 'columnar': _ColumnarWriter}
+
+def export_rows(data, path, fmt=None, chunk_rows=CHUNK_ROWS):
+    """
+    Stream rows (see iter_chunks) to `path` atomically in csv, ndjson or columnar format
+    Returns the row count, timing and throughput of the export.
+    """
+    fmt = fmt or format_for(path)
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown export format {fmt}; use one of {', '.join(WRITERS)}")
+    start = time.perf_counter()
+    rows = 0
+    with atomic_file(path, 'wb') as f:
+        writer = WRITERS[fmt](f)
+        for chunk in iter_chunks(data, chunk_rows):
+            writer.write(chunk)
+            rows += len(chunk)
+        writer.close()
+    seconds = time.perf_counter() - start
+    return {
+        'path': path,
+        'format': fmt,
+        'rows': rows,
+        'bytes': os.path.getsize(path),
+        'seconds': seconds,
+        'rows_per_second': rows / seconds if seconds > 0 else float('inf')
+    }
+
+def read_columnar(path, columns=None):
+    """Read a columnar export (all columns, or just `columns`) back into a DataFrame"""
+    with zipfile.ZipFile(path) as archive:
+        schema = json.loads(archive.read('schema.json'))
+        frame = {}
+        for column in columns or schema['columns']:
+            if column not in schema['columns']:
+                raise KeyError(f"No column {column} in {path}")
+            parts = []
+            for chunk in range(schema['chunks']):
+                with archive.open(f'{column}/{chunk:06d}.npy') as member:
+                    parts.append(np.lib.format.read_array(member, allow_pickle=False))
+            frame[column] = np.concatenate(parts) if parts else np.empty(0, dtype=schema['columns'][column])
+    return pd.DataFrame(frame)
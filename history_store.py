@@ -0,0 +1,240 @@
+import hashlib
+import json
+import os
+from datetime import datetime
+import pandas as pd
+import numpy as np
+
+# On-disk schema: one little-endian binary file per column, rows in date order
+SCHEMA = {
+    'date': '<M8[D]',
+    'open_pana': '<i2',
+    'close_pana': '<i2',
+    'jodi': 'i1',
+    'day_of_week': 'i1',
+    'day_of_month': 'i1',
+    'month': 'i1'
+}
+
+# Compact in-memory layout: a DatetimeIndex named 'date', unsigned numbers and
+# categorical calendar fields, all one or two bytes per row
+FRAME_DTYPES = {
+    'open_pana': np.uint16,
+    'close_pana': np.uint16,
+    'jodi': np.uint8
+}
+CALENDAR_DTYPES = {
+    'day_of_week': pd.CategoricalDtype(np.arange(7, dtype=np.uint8)),
+    'day_of_month': pd.CategoricalDtype(np.arange(1, 32, dtype=np.uint8)),
+    'month': pd.CategoricalDtype(np.arange(1, 13, dtype=np.uint8))
+}
+
+def frame_dates(data):
+    """Draw dates of a history frame as datetime64[D], whether 'date' is a column or the index"""
+    if 'date' in getattr(data, 'columns', ()):
+        return pd.to_datetime(data['date']).to_numpy().astype('datetime64[D]')
+    return np.asarray(data.index, dtype='datetime64[D]')
+
+def compact_frame(data, dates=None):
+    """
+    Convert a history frame to the compact layout
+    Accepts the old layout (string 'date' column, int64 numbers) or raw arrays;
+    `dates` overrides the frame's own dates.
+    """
+    dates = frame_dates(data) if dates is None else np.asarray(dates, dtype='datetime64[D]')
+    frame = {}
+    for column, dtype in FRAME_DTYPES.items():
+        frame[column] = np.asarray(data[column]).astype(dtype, copy=False)
+    for column, dtype in CALENDAR_DTYPES.items():
+        values = data[column]
+        if getattr(values, 'dtype', None) == dtype:
+            frame[column] = values.array
+            continue
+        codes = np.asarray(values).astype(np.int64) - int(dtype.categories[0])
+        frame[column] = pd.Categorical.from_codes(codes.astype(np.int8), dtype=dtype)
+    return pd.DataFrame(frame, index=pd.DatetimeIndex(dates, name='date'))
+
+def frame_version(data):
+    """
+    Content hash identifying one version of a history frame
+    Equal for frames holding the same draws, whichever layout they use.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.ascontiguousarray(frame_dates(data)).tobytes())
+    for column in SCHEMA:
+        if column != 'date':
+            digest.update(np.ascontiguousarray(np.asarray(data[column]), dtype=SCHEMA[column]).tobytes())
+    return digest.hexdigest()
+
+class HistoryStore:
+    """
+    Append-only columnar store for daily draw history (prepend() backfills)
+    Each column lives in its own raw binary file and is memory-mapped on read,
+    so loading a date window never touches the rest of the history.
+    """
+    def __init__(self, path='matka_history'):
+        self.path = path
+        self.meta_file = os.path.join(path, 'meta.json')
+        os.makedirs(path, exist_ok=True)
+        self.rows = self._read_rows()
+
+    def __len__(self):
+        return self.rows
+
+    def _column_file(self, column):
+        return os.path.join(self.path, f'{column}.bin')
+
+    def _read_rows(self):
+        if not os.path.exists(self.meta_file):
+            return 0
+        with open(self.meta_file, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('schema') != SCHEMA:
+            raise ValueError(f"History store at {self.path} has an incompatible schema")
+        return meta['rows']
+
+    def _write_rows(self, rows):
+        tmp_file = self.meta_file + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({'rows': rows, 'schema': SCHEMA}, f, indent=2)
+        os.replace(tmp_file, self.meta_file)
+        self.rows = rows
+
+    def _column(self, column, start=0, stop=None):
+        """Memory-map rows [start, stop) of a single column"""
+        stop = self.rows if stop is None else stop
+        if stop <= start:
+            return np.empty(0, dtype=SCHEMA[column])
+        return np.memmap(self._column_file(column), dtype=SCHEMA[column], mode='r',
+                         offset=start * np.dtype(SCHEMA[column]).itemsize, shape=(stop - start,))
+
+    @property
+    def first_date(self):
+        """Earliest stored draw date, or None for an empty store"""
+        return self._column('date', 0, 1)[0] if self.rows else None
+
+    @property
+    def last_date(self):
+        """Latest stored draw date, or None for an empty store"""
+        return self._column('date', self.rows - 1)[0] if self.rows else None
+
+    @staticmethod
+    def _new_rows(data, after=None, before=None):
+        """
+        Column arrays of a history frame's draws in date order, or None if none are left
+        The last row is kept for any repeated date; only draws dated after
+        `after` and before `before` (when given) are returned.
+        """
+        frame = pd.DataFrame(data)
+        dates = frame_dates(frame)
+        order = np.argsort(dates, kind='stable')
+        dates = dates[order]
+        keep = np.append(dates[1:] != dates[:-1], True) if len(dates) else np.empty(0, dtype=bool)
+        if after is not None:
+            keep &= dates > after
+        if before is not None:
+            keep &= dates < before
+        if not keep.any():
+            return None
+
+        columns = {'date': dates[keep]}
+        for column in SCHEMA:
+            if column != 'date':
+                columns[column] = frame[column].to_numpy()[order][keep]
+        return columns
+
+    def append(self, data):
+        """
+        Append draws from a DataFrame with the history schema
+        Rows dated on or before the last stored draw are skipped, so
+        re-ingesting an overlapping window is safe.
+        """
+        columns = self._new_rows(data, after=self.last_date if self.rows else None)
+        if columns is None:
+            return 0
+
+        # Column files first, row count last: a crash mid-write leaves the old count valid
+        for column, values in columns.items():
+            with open(self._column_file(column), 'r+b' if os.path.exists(self._column_file(column)) else 'wb') as f:
+                f.seek(self.rows * np.dtype(SCHEMA[column]).itemsize)
+                f.write(np.ascontiguousarray(values, dtype=SCHEMA[column]).tobytes())
+                f.truncate()
+
+        added = len(columns['date'])
+        self._write_rows(self.rows + added)
+        print(f"[OK] Stored {added} new draws in {self.path} ({self.rows} total)")
+        return added
+
+    def prepend(self, data):
+        """
+        Backfill draws dated before the first stored draw
+        Unlike append this rewrites every column file: all new files are written
+        first and then swapped in, and the row count is updated last.
+        """
+        if not self.rows:
+            return self.append(data)
+        columns = self._new_rows(data, before=self.first_date)
+        if columns is None:
+            return 0
+
+        tmp_files = {}
+        for column, values in columns.items():
+            stored = np.array(self._column(column))
+            tmp_files[column] = self._column_file(column) + '.tmp'
+            with open(tmp_files[column], 'wb') as f:
+                f.write(np.ascontiguousarray(values, dtype=SCHEMA[column]).tobytes())
+                f.write(stored.tobytes())
+        for column, tmp_file in tmp_files.items():
+            os.replace(tmp_file, self._column_file(column))
+
+        added = len(columns['date'])
+        self._write_rows(self.rows + added)
+        print(f"[OK] Backfilled {added} older draws in {self.path} ({self.rows} total)")
+        return added
+
+    def load(self, start=None, end=None):
+        """
+        Load draws with start <= date <= end (both optional) as a DataFrame
+        Rows come back oldest first in the compact layout (see compact_frame),
+        like KalyanMatkaPredictor.scrape_historical_data.
+        """
+        return self._frame(*self._row_range(start, end))
+
+    def _row_range(self, start=None, end=None):
+        """Row positions [lo, hi) of the draws with start <= date <= end"""
+        dates = self._column('date')
+        lo = 0 if start is None else int(np.searchsorted(dates, np.datetime64(start, 'D'), side='left'))
+        hi = self.rows if end is None else int(np.searchsorted(dates, np.datetime64(end, 'D'), side='right'))
+        return lo, max(lo, hi)
+
+    def _frame(self, lo, hi):
+        frame = {column: self._column(column, lo, hi) for column in SCHEMA if column != 'date'}
+        return compact_frame(frame, dates=np.asarray(self._column('date', lo, hi)))
+
+    def iter_chunks(self, chunk_rows=50_000, start=None, end=None):
+        """
+        Draws with start <= date <= end as compact frames of at most `chunk_rows`
+        rows, oldest first; only one chunk is held in memory at a time
+        """
+        lo, hi = self._row_range(start, end)
+        for chunk in range(lo, hi, chunk_rows):
+            yield self._frame(chunk, min(hi, chunk + chunk_rows))
+
+    def load_days(self, days, end=None):
+        """Load the `days` calendar days ending at `end` (default: last stored draw)"""
+        end = self.last_date if end is None else np.datetime64(end, 'D')
+        if end is None:
+            return self.load()
+        return self.load(start=end - np.timedelta64(days - 1, 'D'), end=end)
+
+    def import_csv(self, filename):
+        """Ingest a CSV written by DataManager.export_to_csv"""
+        print(f"[INFO] Importing history from {filename}...")
+        return self.append(pd.read_csv(filename))
+
+    def missing_days(self, today=None):
+        """Number of calendar days between the last stored draw and `today`"""
+        today = np.datetime64((today or datetime.now()).strftime('%Y-%m-%d'), 'D')
+        if not self.rows:
+            return None
+        return max(0, int((today - self.last_date).astype(np.int64)))
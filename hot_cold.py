@@ -0,0 +1,101 @@
+import numpy as np
+
+class HotColdTracker:
+    """
+    Sliding-window jodi counters for hot/cold number tracking
+    A ring buffer holds the most recent draws so every window (in draws, i.e.
+    days) drops its oldest jodi in O(1) as a new one arrives. A "last seen"
+    index gives days since each jodi was last drawn.
+    """
+    def __init__(self, windows=(7, 30, 90)):
+        self.windows = tuple(sorted(set(windows)))
+        self.size = self.windows[-1]
+        self.ring = np.zeros(self.size, dtype=np.int64)
+        self.counts = {window: np.zeros(100, dtype=np.int64) for window in self.windows}
+        self.last_seen = np.full(100, -1, dtype=np.int64)
+        self.draws = 0
+
+    @classmethod
+    def from_frame(cls, data, windows=(7, 30, 90)):
+        """Build a tracker from a history DataFrame in date order"""
+        tracker = cls(windows)
+        if len(data):
+            tracker.extend(data.sort_values('date', kind='stable')['jodi'])
+        return tracker
+
+    def recent(self, window=None):
+        """The last `window` jodis drawn, oldest first"""
+        window = min(self.size if window is None else window, self.draws)
+        positions = np.arange(self.draws - window, self.draws) % self.size
+        return self.ring[positions]
+
+    def push(self, jodi):
+        """Record a single new draw"""
+        jodi = int(jodi)
+        for window, counts in self.counts.items():
+            if self.draws >= window:
+                counts[self.ring[(self.draws - window) % self.size]] -= 1
+            counts[jodi] += 1
+        self.ring[self.draws % self.size] = jodi
+        self.last_seen[jodi] = self.draws
+        self.draws += 1
+
+    def extend(self, jodis):
+        """Record many draws in date order with one recount per window"""
+        jodis = np.asarray(jodis, dtype=np.int64)
+        if len(jodis) == 0:
+            return
+        np.maximum.at(self.last_seen, jodis, np.arange(self.draws, self.draws + len(jodis)))
+        tail = np.concatenate([self.recent(), jodis])[-self.size:]
+        self.draws += len(jodis)
+        self.ring[np.arange(self.draws - len(tail), self.draws) % self.size] = tail
+        for window in self.windows:
+            self.counts[window] = np.bincount(tail[-window:], minlength=100)
+
+    def days_since(self, number):
+        """Draws since `number` last came up, or None if it never has"""
+        last = self.last_seen[number]
+        return None if last < 0 else int(self.draws - 1 - last)
+
+    def window_counts(self, window):
+        """
+        Jodi counts over the last `window` draws
+        Tracked windows are kept up to date; others up to the largest tracked
+        window are counted from the ring buffer on demand.
+        """
+        if window in self.counts:
+            return self.counts[window]
+        if not 0 < window <= self.size:
+            raise ValueError(f"window must be between 1 and {self.size} draws, got {window}")
+        return np.bincount(self.recent(window), minlength=100)
+
+    def hot(self, window=30, k=5):
+        """Most drawn jodis within the window, ties broken by the smaller number"""
+        counts = self.window_counts(window)[10:]
+        seen = np.flatnonzero(counts)
+        return (seen[np.argsort(-counts[seen], kind='stable')][:k] + 10).tolist()
+
+    def cold(self, window=30, k=5, by='gap'):
+        """
+        Coldest jodis, ranked by days since last seen (by='gap') or by
+        fewest draws within the window (by='count')
+        `window` only applies to by='count'; gaps run over the whole history,
+        so the longest-absent jodis are the same for every window.
+        """
+        if by == 'count':
+            order = np.argsort(self.window_counts(window)[10:], kind='stable')
+        else:
+            # Never-drawn jodis have last_seen -1 and so rank as the longest gap
+            order = np.argsort(self.last_seen[10:], kind='stable')
+        return (order[:k] + 10).tolist()
+
+    def summary(self, k=5):
+        """Hot and cold lists for every tracked window"""
+        return {
+            window: {
+                'hot_numbers': self.hot(window, k),
+                'cold_numbers': self.cold(window, k),
+                'coldest_by_count': self.cold(window, k, by='count')
+            }
+            for window in self.windows
+        }
@@ -0,0 +1,192 @@
+"""
+Stage timing telemetry for the prediction pipeline
+
+    @instrumented('predictor.analyze_patterns')
+    def analyze_patterns(self): ...
+
+    with stage('bot.send', market='Kalyan'):
+        ...
+    annotate(rows=len(data))   # add fields to the innermost running stage
+
+Every finished stage becomes one JSON record (wall and CPU seconds, rows, RSS
+change, enclosing stage in the same thread or task) written as a line to the
+configured sink. Telemetry is off unless MATKA_TELEMETRY names a file (or '-'
+for stderr) or enable() is called; while off, decorated functions pay one
+flag check per call.
+"""
+import contextvars
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+_ENABLED = False
+_SINK = None
+_LOCK = threading.Lock()
+_CURRENT = contextvars.ContextVar('matka_stage', default=None)
+
+# The last finished stages, newest last, for in-process inspection
+RECENT = deque(maxlen=1000)
+
+def _rss_bytes():
+    """Current resident memory from /proc, or None where unavailable"""
+    try:
+        with open('/proc/self/statm', 'rb') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def enable(path='-'):
+    """Start recording stages to a JSON-lines file, or stderr for '-'"""
+    global _ENABLED, _SINK
+    with _LOCK:
+        if _SINK is not None and _SINK is not sys.stderr:
+            _SINK.close()
+        _SINK = sys.stderr if path == '-' else open(path, 'a', encoding='utf-8')
+        _ENABLED = True
+
+def disable():
+    """Stop recording; stages become no-ops again"""
+    global _ENABLED, _SINK
+    with _LOCK:
+        _ENABLED = False
+        if _SINK is not None and _SINK is not sys.stderr:
+            _SINK.close()
+        _SINK = None
+
+def is_enabled():
+    return _ENABLED
+
+def _emit(record):
+    line = json.dumps(record, default=str)
+    with _LOCK:
+        RECENT.append(record)
+        if _SINK is not None:
+            _SINK.write(line + '\n')
+            _SINK.flush()
+
+class _Stage:
+    """One running stage; its fields become the emitted record"""
+    __slots__ = ('fields', 'token', 'wall', 'cpu', 'rss')
+
+    def __init__(self, name, fields):
+        self.fields = {'stage': name, **fields}
+
+    def set(self, **fields):
+        self.fields.update(fields)
+
+    def __enter__(self):
+        parent = _CURRENT.get()
+        if parent is not None:
+            self.fields['parent'] = parent.fields['stage']
+        self.token = _CURRENT.set(self)
+        self.rss = _rss_bytes()
+        self.cpu = time.process_time()
+        self.wall = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self.wall
+        cpu = time.process_time() - self.cpu
+        rss = _rss_bytes()
+        _CURRENT.reset(self.token)
+        self.fields.update({
+            'started_at': datetime.fromtimestamp(time.time() - wall).isoformat(),
+            'wall_seconds': wall,
+            'cpu_seconds': cpu,
+            'rss_delta_bytes': rss - self.rss if rss is not None and self.rss is not None else None,
+            'thread': threading.current_thread().name,
+            'ok': exc_type is None
+        })
+        if exc_type is not None:
+            self.fields['error'] = f'{exc_type.__name__}: {exc}'
+        _emit(self.fields)
+        return False
+
+class _NullStage:
+    """Stand-in while telemetry is off"""
+    __slots__ = ()
+
+    def set(self, **fields):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NULL_STAGE = _NullStage()
+
+def stage(name, **fields):
+    """Context manager timing one stage; extra keyword fields go into its record"""
+    return _Stage(name, fields) if _ENABLED else _NULL_STAGE
+
+def annotate(**fields):
+    """Add fields (e.g. rows=...) to the innermost running stage, if any"""
+    if _ENABLED:
+        current = _CURRENT.get()
+        if current is not None:
+            current.set(**fields)
+
+def instrumented(name=None, rows=None):
+    """
+    Decorator timing every call as a stage
+    `rows` is an optional function of the return value giving the row count,
+    e.g. rows=len for a function returning a DataFrame.
+    """
+    def decorate(func):
+        stage_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _ENABLED:
+                return func(*args, **kwargs)
+            with _Stage(stage_name, {}) as running:
+                result = func(*args, **kwargs)
+                if rows is not None:
+                    running.set(rows=rows(result))
+                return result
+        return wrapper
+    return decorate
+
+class profiled:
+    """
+    Context manager running cProfile over one job, in the current thread
+    The stats are dumped to `path` (open with pstats or snakeviz) and the top
+    `top` functions by cumulative time are printed.
+
+    cProfile only sees the thread that enabled it: work handed to a thread
+    pool (train_prediction_model's per-target fits, sklearn's n_jobs) is
+    missing from the stats, so profile with workers=1. On Python 3.12+ only
+    one profiler can be active at a time, so profiled jobs must not overlap.
+    """
+    def __init__(self, path, top=15):
+        import cProfile
+
+        self.path = path
+        self.top = top
+        self.profile = cProfile.Profile()
+
+    def __enter__(self):
+        self.profile.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        import io
+        import pstats
+
+        self.profile.disable()
+        self.profile.dump_stats(self.path)
+        out = io.StringIO()
+        pstats.Stats(self.profile, stream=out).sort_stats('cumulative').print_stats(self.top)
+        print(out.getvalue())
+        print(f"[OK] Profile saved to {self.path}")
+        return False
+
+if os.environ.get('MATKA_TELEMETRY'):
+    enable(os.environ['MATKA_TELEMETRY'])
@@ -0,0 +1,105 @@
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from matka_predictor import KalyanMatkaPredictor
+from history_store import HistoryStore
+from model_cache import ModelCache
+from prediction_journal import PredictionJournal
+from instrumentation import instrumented, annotate
+
+def market_slug(name):
+    """Filesystem-safe lower-case name, e.g. 'Milan Day' -> 'milan_day'"""
+    return re.sub(r'[^a-z0-9]+', '_', name.lower()).strip('_')
+
+class Market:
+    """
+    One market's independent state: history store, predictor (with its running
+    statistics and models) and model cache; `simulate` fills the store with
+    simulated draws (see KalyanMatkaPredictor.load_history)
+    """
+    def __init__(self, name, store, model_cache, days=365, keep_models=True, journal=None, simulate=False):
+        self.name = name
+        self.slug = market_slug(name)
+        self.predictor = KalyanMatkaPredictor(market=name, journal=journal)
+        self.store = store
+        self.model_cache = model_cache
+        self.days = days
+        self.keep_models = keep_models
+        self.simulate = simulate
+
+    def release_models(self):
+        """
+        Drop the fitted forests; the model cache reloads them on the next run
+        The compiled lookup tables are kept, so predictions still work.
+        """
+        self.predictor.jodi_model = self.predictor.open_model = self.predictor.close_model = None
+
+    @instrumented('market.generate_report')
+    def generate_report(self, workers=None):
+        """Refresh history, train and build today's report for this market"""
+        print(f"[INFO] Generating {self.name} report...")
+        annotate(market=self.name)
+        self.predictor.load_history(self.store, days=self.days, simulate=self.simulate)
+        self.predictor.train_prediction_model(cache=self.model_cache, workers=workers)
+        report = self.predictor.generate_daily_report()
+        if not self.keep_models:
+            self.release_models()
+        return report
+
+class MarketRegistry:
+    """
+    Hosts many markets' predictors in one process
+    Markets share a single worker pool; each keeps its own history window,
+    statistics and models, so memory per market is bounded by `days` and the
+    model cache size. All markets share one prediction journal (by default
+    the predictions.db every other entry point uses).
+    """
+    def __init__(self, root='markets', workers=None, journal=None):
+        self.root = root
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = ThreadPoolExecutor(max_workers=self.workers)
+        self.markets = {}
+        # The same predictions.db that main(), `matka_cli predict` and `accuracy` use
+        self.journal = journal if journal is not None else PredictionJournal()
+
+    def __iter__(self):
+        return iter(self.markets.values())
+
+    def __len__(self):
+        return len(self.markets)
+
+    def get(self, name):
+        return self.markets[name]
+
+    def register(self, name, store=None, model_cache=None, days=365, keep_models=True, max_cached_models=6,
+                 simulate=False):
+        """Add a market; its store and model cache default to folders under root"""
+        if name in self.markets:
+            raise ValueError(f"Market {name} is already registered")
+        folder = os.path.join(self.root, market_slug(name))
+        if store is None:
+            store = HistoryStore(os.path.join(folder, 'history'))
+        if model_cache is None:
+            model_cache = ModelCache(os.path.join(folder, 'models'), max_entries=max_cached_models)
+
+        market = Market(name, store, model_cache, days=days, keep_models=keep_models, journal=self.journal,
+                        simulate=simulate)
+        self.markets[name] = market
+        return market
+
+    def training_workers(self):
+        """Cores each market's training may use when every market runs at once"""
+        return max(1, self.workers // max(1, min(len(self.markets), self.workers)))
+
+    def generate_reports(self):
+        """Generate every market's report in one pass over the shared pool"""
+        workers = self.training_workers()
+        futures = {
+            name: self.executor.submit(market.generate_report, workers)
+            for name, market in self.markets.items()
+        }
+        return {name: future.result() for name, future in futures.items()}
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
+        self.journal.close()
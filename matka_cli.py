@@ -0,0 +1,225 @@
+"""
+Command line entry point for the Matka tools
+
+    python matka_cli.py latest              # print the newest saved prediction
+    python matka_cli.py predict --days 365  # train on stored history, save today's report (--simulate fills gaps)
+    python matka_cli.py analyze             # analysis + comprehensive JSON reports
+    python matka_cli.py export --days 180   # history store -> CSV (or --format ndjson/columnar)
+    python matka_cli.py accuracy --days 30  # hit rates from the prediction journal
+    python matka_cli.py bot                 # run the scheduled bot
+    python matka_cli.py startup             # measure `latest` startup with -X importtime
+
+Add --telemetry FILE (or '-' for stderr) before the subcommand to log per-stage
+timings as JSON lines; `predict --profile FILE` captures a cProfile of the run.
+
+Only the standard library is imported at module level; pandas, numpy and
+sklearn are imported inside the subcommands that need them, so cheap
+commands like `latest` start in tens of milliseconds.
+"""
+import argparse
+import contextlib
+import glob
+import os
+import re
+import sys
+from datetime import datetime
+
+# Modules that must not be imported by the cheap commands
+HEAVY_MODULES = ('pandas', 'numpy', 'sklearn', 'requests', 'telegram')
+
+def market_slug(name):
+    """Same as market_registry.market_slug, which can't be imported without the heavy modules"""
+    return re.sub(r'[^a-z0-9]+', '_', name.lower()).strip('_')
+
+def cmd_latest(args):
+    """Print the most recently saved prediction report"""
+    pattern = re.compile(r'prediction_.*\.txt$')
+    files = [f for f in glob.glob(os.path.join(args.dir, '*prediction_*.txt')) if pattern.search(f)]
+    if args.market:
+        slug = market_slug(args.market)
+        files = [f for f in files if slug in os.path.basename(f)]
+    if not files:
+        print("[ERROR] No saved predictions found")
+        return 1
+
+    latest = max(files, key=os.path.getmtime)
+    with open(latest, 'r', encoding='utf-8') as f:
+        print(f.read())
+    print(f"[INFO] From {latest}")
+    return 0
+
+def cmd_predict(args):
+    """Refresh history, train and save today's report"""
+    from matka_predictor import KalyanMatkaPredictor
+    from history_store import HistoryStore
+    from model_cache import ModelCache
+    from prediction_journal import PredictionJournal
+    from instrumentation import profiled
+    from exporters import atomic_file
+
+    predictor = KalyanMatkaPredictor(market=args.market, journal=PredictionJournal(args.journal))
+    with profiled(args.profile) if args.profile else contextlib.nullcontext():
+        predictor.load_history(HistoryStore(args.store), days=args.days, simulate=args.simulate)
+        if len(predictor.data) == 0:
+            print(f"[ERROR] No history in {args.store}; import results first or pass --simulate")
+            return 1
+        # cProfile only sees this thread, so a profiled run trains inline
+        predictor.train_prediction_model(cache=ModelCache(args.models), workers=1 if args.profile else args.workers)
+        report = predictor.generate_daily_report()
+
+    filename = f"{market_slug(args.market)}_prediction_{datetime.now().strftime('%Y%m%d')}.txt"
+    with atomic_file(filename, 'w', encoding='utf-8') as f:
+        f.write(report)
+    print(f"[OK] Prediction saved to file: {filename}")
+    return 0
+
+def cmd_analyze(args):
+    """Write the analysis and comprehensive JSON reports"""
+    import data_utils
+
+    data_utils.main(simulate=args.simulate)
+    return 0
+
+def cmd_export(args):
+    """Stream a window of the history store to CSV, NDJSON or columnar binary"""
+    from history_store import HistoryStore
+    from data_utils import DataManager
+
+    store = HistoryStore(args.store)
+    DataManager(store).export_history(args.output, fmt=args.format, days=args.days, chunk_rows=args.chunk_rows)
+    return 0
+
+def cmd_accuracy(args):
+    """Print running hit rates, and recent daily hits, from the prediction journal"""
+    from datetime import timedelta
+    from prediction_journal import PredictionJournal
+
+    journal = PredictionJournal(args.journal)
+    rates = journal.hit_rates(args.market)
+    if rates.empty:
+        print("[ERROR] No scored predictions in the journal yet")
+        return 1
+    print(rates.to_string(index=False))
+
+    if args.days:
+        start = (datetime.now() - timedelta(days=args.days - 1)).strftime('%Y-%m-%d')
+        for market in rates['market'].unique():
+            daily = journal.daily_hits(market, start=start)
+            if len(daily):
+                print(f"\n{market}, last {args.days} days:")
+                print(daily.to_string(index=False))
+    return 0
+
+def cmd_bot(args):
+    """Run the scheduled prediction bot"""
+    from advanced_bot import AdvancedMatkaBot
+
+    bot = AdvancedMatkaBot(telegram_token=args.token or os.environ.get('TELEGRAM_TOKEN'),
+                           chat_id=args.chat_id, schedule_times=tuple(args.at), profile_dir=args.profile_dir,
+                           simulate=args.simulate)
+    bot.schedule_predictions()
+    return 0
+
+def cmd_startup(args):
+    """Measure the import cost of `latest` with python -X importtime"""
+    import subprocess
+
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', os.path.abspath(__file__), 'latest', '--dir', args.dir],
+        capture_output=True, text=True
+    )
+
+    # Lines look like "import time: self [us] | cumulative | <2 spaces per level>package".
+    # Everything up to and including `site` is interpreter start-up, not ours.
+    imports = []
+    for line in result.stderr.splitlines():
+        parts = line.split('|')
+        if line.startswith('import time:') and len(parts) == 3 and parts[1].strip().isdigit():
+            name = parts[2].rstrip()
+            level = (len(name) - len(name.lstrip()) - 1) // 2
+            imports.append((name.strip(), level, int(parts[1])))
+    site = max((i for i, (name, level, _) in enumerate(imports) if name == 'site' and level == 0), default=-1)
+    imports = imports[site + 1:]
+
+    top_level = {name: us for name, level, us in imports if level == 0}
+    total_ms = sum(top_level.values()) / 1000
+    heavy = sorted({name for name, _, _ in imports if name.split('.')[0] in HEAVY_MODULES})
+
+    for name, us in sorted(top_level.items(), key=lambda item: -item[1])[:10]:
+        print(f"{us / 1000:8.1f} ms  {name}")
+    print(f"[INFO] Total import time for `latest`: {total_ms:.1f} ms (budget {args.budget_ms} ms)")
+
+    if heavy:
+        print(f"[ERROR] Heavy modules imported: {', '.join(heavy[:5])}")
+        return 1
+    if total_ms > args.budget_ms:
+        print("[ERROR] Startup budget exceeded")
+        return 1
+    print("[OK] Startup within budget")
+    return 0
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Matka prediction tools (educational use only)")
+    parser.add_argument('--telemetry', default=None, metavar='FILE',
+                        help="log per-stage timings as JSON lines ('-' for stderr)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    latest = subparsers.add_parser('latest', help="print the newest saved prediction")
+    latest.add_argument('--market', help="only reports for this market")
+    latest.add_argument('--dir', default='.', help="folder holding the prediction files")
+    latest.set_defaults(func=cmd_latest)
+
+    predict = subparsers.add_parser('predict', help="train and save today's prediction")
+    predict.add_argument('--market', default='Kalyan')
+    predict.add_argument('--days', type=int, default=365, help="history window to train on")
+    predict.add_argument('--store', default='matka_history', help="history store folder")
+    predict.add_argument('--models', default='model_cache', help="model cache folder")
+    predict.add_argument('--workers', type=int, default=None, help="cores to train with")
+    predict.add_argument('--profile', default=None, metavar='FILE', help="save a cProfile of the run")
+    predict.add_argument('--journal', default='predictions.db', help="prediction journal database")
+    predict.add_argument('--simulate', action='store_true', help="fill missing history with simulated draws")
+    predict.set_defaults(func=cmd_predict)
+
+    analyze = subparsers.add_parser('analyze', help="write analysis and comprehensive reports")
+    analyze.add_argument('--simulate', action='store_true', help="fill missing history with simulated draws")
+    analyze.set_defaults(func=cmd_analyze)
+
+    export = subparsers.add_parser('export', help="export stored history to CSV, NDJSON or columnar binary")
+    export.add_argument('--store', default='matka_history', help="history store folder")
+    export.add_argument('--days', type=int, default=None, help="only the last N days")
+    export.add_argument('--format', choices=('csv', 'ndjson', 'columnar'), default='csv', help="output format")
+    export.add_argument('--chunk-rows', type=int, default=50_000, help="rows written per chunk")
+    export.add_argument('--output', default=None, help="output file name")
+    export.set_defaults(func=cmd_export)
+
+    accuracy = subparsers.add_parser('accuracy', help="hit rates from the prediction journal")
+    accuracy.add_argument('--market', default=None, help="only this market")
+    accuracy.add_argument('--days', type=int, default=None, help="also show daily hits for the last N days")
+    accuracy.add_argument('--journal', default='predictions.db', help="prediction journal database")
+    accuracy.set_defaults(func=cmd_accuracy)
+
+    bot = subparsers.add_parser('bot', help="run the scheduled prediction bot")
+    bot.add_argument('--token', default=None, help="Telegram token (or TELEGRAM_TOKEN)")
+    bot.add_argument('--chat-id', default="YOUR_CHAT_ID")
+    bot.add_argument('--at', nargs='+', default=["09:00", "21:00"], help="daily HH:MM run times")
+    bot.add_argument('--profile-dir', default=None, help="cProfile the first job into this folder")
+    bot.add_argument('--simulate', action='store_true', help="fill missing history with simulated draws")
+    bot.set_defaults(func=cmd_bot)
+
+    startup = subparsers.add_parser('startup', help="measure `latest` startup time")
+    startup.add_argument('--dir', default='.', help="folder holding the prediction files")
+    startup.add_argument('--budget-ms', type=float, default=50)
+    startup.set_defaults(func=cmd_startup)
+
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.telemetry:
+        import instrumentation
+
+        instrumentation.enable(args.telemetry)
+    return args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
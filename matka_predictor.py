@@ -1,22 +1,87 @@
 import pandas as pd
 import numpy as np
-import requests
-from datetime import datetime, timedelta
-import json
+from datetime import datetime
+import os
 import time
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import accuracy_score
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from history_store import HistoryStore, compact_frame, frame_dates, frame_version, CALENDAR_DTYPES
+from pattern_stats import PatternStats
+from hot_cold import HotColdTracker
+from transition_model import TransitionModel
+from model_cache import ModelCache
+from compiled_forest import CompiledForest
+from report_cache import AnalysisSnapshot, ReportCache
+from prediction_journal import PredictionJournal
+from pana_table import PANAS, sample_panas, jodi_anks
+from instrumentation import instrumented, annotate
 import warnings
 warnings.filterwarnings('ignore')
 
+# Inclusive value range of each model feature, for the compiled lookup tables
+FEATURE_DOMAIN = tuple((int(dtype.categories[0]), int(dtype.categories[-1])) for dtype in CALENDAR_DTYPES.values())
+
+def calendar_features(dates):
+    """
+    Model features (day_of_week, day_of_month, month) for an array of dates
+    Derived from the day/month counts since 1970-01-01 (a Thursday), no per-row datetime.
+    """
+    dates = np.asarray(dates, dtype='datetime64[D]')
+    month_starts = dates.astype('datetime64[M]')
+    
+    return pd.DataFrame({
+        'day_of_week': ((dates.astype(np.int64) + 3) % 7).astype(np.int8),
+        'day_of_month': ((dates - month_starts).astype(np.int64) + 1).astype(np.int8),
+        'month': (month_starts.astype(np.int64) % 12 + 1).astype(np.int8)
+    })
+
+def generate_history(days=365, end=None, rng=None):
+    """
+    Generate `days` rows of simulated history ending at `end` (default today)
+    All columns are built as NumPy arrays in one pass, newest date first, in
+    the compact layout (date index, uint8/uint16 numbers, categorical calendar).
+    Panas are drawn from the 220 valid panas, as real results are; this also
+    keeps the pana forests to 220 classes rather than every 3-digit number.
+    `rng` may be a numpy.random.Generator or a seed for a reproducible run.
+    """
+    if not isinstance(rng, np.random.Generator):
+        rng = np.random.default_rng(rng)
+    if end is None:
+        end = datetime.now()
+    
+    last = np.datetime64(end.strftime('%Y-%m-%d'), 'D')
+    dates = last - np.arange(days, dtype='timedelta64[D]')
+    
+    history = calendar_features(dates)
+    history['open_pana'] = rng.choice(PANAS, size=days).astype(np.uint16)
+    history['close_pana'] = rng.choice(PANAS, size=days).astype(np.uint16)
+    history['jodi'] = rng.integers(10, 100, size=days, dtype=np.uint8)  # 10-99 inclusive
+    return compact_frame(history, dates=dates)
+
 class KalyanMatkaPredictor:
-    def __init__(self):
+    def __init__(self, market='Kalyan', journal=None):
+        self.market = market
         self.data = []
         self.model = None
-        self.prediction_history = []
+        # Every prediction (and every loaded draw, for scoring) goes to the journal when one is set
+        self.journal = journal
+        self.last_prediction = None
+        self.stats = None
+        self.stats_data = None
+        self.hot_cold = None
+        self.hot_cold_data = None
+        self.transitions = None
+        self.transitions_data = None
+        self.snapshot = None
+        self.snapshot_data = None
+        # Bumped on every training run; part of the daily report's cache key
+        self.models_version = 0
+        # Trained forests compiled to lookup tables, used for every prediction
+        self.compiled_models = {}
+        self.reports = ReportCache()
         
-    def scrape_historical_data(self, days=365):
+    @instrumented('predictor.scrape_historical_data', rows=len)
+    def scrape_historical_data(self, days=365, rng=None):
         """
         Simulate historical data scraping from matka websites
         In real implementation, you would scrape from actual websites
@@ -25,43 +90,135 @@ class KalyanMatkaPredictor:
         
         # Simulated historical data structure
         # In real implementation, scrape from sattamatkadpboss.co or similar sites
-        historical_data = []
-        
-        for i in range(days):
-            date = datetime.now() - timedelta(days=i)
-            
-            # Generate realistic-looking historical data
-            open_pana = np.random.randint(100, 999)
-            close_pana = np.random.randint(100, 999)
-            jodi = np.random.randint(10, 99)
-            
-            historical_data.append({
-                'date': date.strftime('%Y-%m-%d'),
-                'open_pana': open_pana,
-                'close_pana': close_pana,
-                'jodi': jodi,
-                'day_of_week': date.weekday(),
-                'day_of_month': date.day,
-                'month': date.month
-            })
-        
-        self.data = pd.DataFrame(historical_data)
+        self.data = generate_history(days, rng=rng)
         print(f"[OK] Collected {len(self.data)} days of historical data")
         return self.data
     
+    @instrumented('predictor.load_history', rows=len)
+    def load_history(self, store, days=365, ingest=None, simulate=False):
+        """
+        Load the last `days` of history from a HistoryStore
+        Draws missing since the last stored date are collected and appended first
+        by `ingest(store)` (e.g. a WebScraper.ingest partial). With simulate=True
+        they are simulated instead, and simulated history is also backfilled
+        when the store starts after the window does; simulated rows are stored
+        for good, so never simulate into a store holding imported results.
+        A window still short of `days` draws is warned about.
+        """
+        previous = self.data
+        missing = store.missing_days()
+        if ingest is not None:
+            if missing is None or missing > 0:
+                ingest(store)
+        elif simulate and missing is None:
+            store.append(self.scrape_historical_data(days=days))
+        elif simulate and missing > 0:
+            store.append(self.scrape_historical_data(days=missing))
+        
+        end = datetime.now()
+        start = np.datetime64(end.strftime('%Y-%m-%d'), 'D') - np.timedelta64(days - 1, 'D')
+        if simulate and ingest is None and len(store) and store.first_date > start:
+            gap = int((store.first_date - start).astype(np.int64))
+            print(f"[INFO] Backfilling {gap} days before {store.first_date}...")
+            before = pd.Timestamp(store.first_date - np.timedelta64(1, 'D')).to_pydatetime()
+            store.prepend(generate_history(gap, end=before))
+        
+        self.data = store.load_days(days, end=end)
+        if len(self.data) < days:
+            print(f"[WARNING] {store.path} holds only {len(self.data)} of the last {days} days; "
+                  f"training on the shorter history")
+        self._slide_stats(previous)
+        if self.journal is not None:
+            self.journal.record_draws(self.market, self.data)
+        print(f"[OK] Loaded {len(self.data)} days of history from {store.path}")
+        return self.data
+    
+    def _slide_stats(self, previous):
+        """
+        Move the running statistics from the `previous` window to self.data
+        Only the draws that left or entered the window are touched. The
+        hot/cold tracker only slides forward over windows at least as long as
+        its own and the transition model over windows of its own length;
+        otherwise they are rebuilt on use.
+        """
+        if len(previous) == 0 or len(self.data) == 0:
+            return
+        previous_dates, dates = frame_dates(previous), frame_dates(self.data)
+        if previous_dates.max() < dates.min() or dates.max() < previous_dates.min():
+            return  # No overlap, get_stats() and get_hot_cold() rebuild from scratch
+        
+        added = self.data[dates > previous_dates.max()]
+        # A longer window (a larger `days`) also reaches back past the previous one
+        older = self.data[dates < previous_dates.min()]
+        if self.stats is not None and self.stats_data is previous:
+            self.stats.remove_frame(previous[(previous_dates < dates.min()) | (previous_dates > dates.max())])
+            self.stats.update_frame(older)
+            self.stats.update_frame(added)
+            self.stats_data = self.data
+        if len(older):
+            return
+        if (self.hot_cold is not None and self.hot_cold_data is previous
+                and min(len(previous), len(self.data)) >= self.hot_cold.size):
+            self.hot_cold.extend(added['jodi'])
+            self.hot_cold_data = self.data
+        if (self.transitions is not None and self.transitions_data is previous
+                and self.transitions.window == max(1, len(self.data) - 1)):
+            self.transitions.extend(added['jodi'])
+            self.transitions_data = self.data
+    
+    def get_stats(self):
+        """
+        Running pattern statistics for self.data
+        Rebuilt only when self.data has been replaced outside load_history.
+        """
+        if self.stats is None or self.stats_data is not self.data:
+            self.stats = PatternStats.from_frame(self.data)
+            self.stats_data = self.data
+        return self.stats
+    
+    def get_hot_cold(self):
+        """
+        Sliding-window hot/cold tracker for self.data
+        Rebuilt only when self.data has been replaced outside load_history.
+        """
+        if self.hot_cold is None or self.hot_cold_data is not self.data:
+            self.hot_cold = HotColdTracker.from_frame(self.data)
+            self.hot_cold_data = self.data
+        return self.hot_cold
+    
+    def get_transitions(self):
+        """
+        Jodi transition (Markov) model over self.data
+        Windowed to the loaded history's length, so sliding the window in
+        load_history drops the oldest transitions as new draws arrive; a
+        window of another length rebuilds the model.
+        """
+        if self.transitions is None or self.transitions_data is not self.data:
+            self.transitions = TransitionModel.from_frame(self.data, window=max(1, len(self.data) - 1))
+            self.transitions_data = self.data
+        return self.transitions
+    
+    def analysis_snapshot(self):
+        """
+        Report aggregates for self.data, built once per history version
+        A reloaded frame holding the same draws keeps the existing snapshot.
+        """
+        if self.snapshot is None or self.snapshot_data is not self.data:
+            version = frame_version(self.data)
+            if self.snapshot is None or self.snapshot.version != version:
+                self.snapshot = AnalysisSnapshot(self.data, self.get_stats(), self.get_hot_cold(), version)
+            self.snapshot_data = self.data
+        return self.snapshot
+    
+    @instrumented('predictor.analyze_patterns')
     def analyze_patterns(self):
         """
         Analyze historical patterns and frequencies
         """
         print("[INFO] Analyzing patterns...")
+        annotate(rows=len(self.data))
         
-        analysis = {
-            'most_frequent_jodis': self.data['jodi'].value_counts().head(10),
-            'most_frequent_open_panas': self.data['open_pana'].value_counts().head(10),
-            'most_frequent_close_panas': self.data['close_pana'].value_counts().head(10),
-            'day_wise_patterns': self.data.groupby('day_of_week')['jodi'].mean(),
-            'monthly_patterns': self.data.groupby('month')['jodi'].mean()
-        }
+        analysis = self.analysis_snapshot().analysis
         
         print("[INFO] Pattern Analysis Complete:")
         print(f"Most frequent Jodi: {analysis['most_frequent_jodis'].index[0]}")
@@ -69,38 +226,150 @@ class KalyanMatkaPredictor:
         
         return analysis
     
-    def train_prediction_model(self):
+    @instrumented('predictor.fit_target')
+    def _fit_target(self, name, model, X_train, X_test, y_train, y_test, cache):
+        """Fit one target model and score it on the shared test split"""
+        from sklearn.metrics import accuracy_score
+        
+        annotate(target=name, rows=len(y_train))
+        start = time.perf_counter()
+        if cache is not None:
+            model = cache.fit(model, X_train, y_train, name=name)
+        else:
+            model.fit(X_train, y_train)
+        fit_seconds = time.perf_counter() - start
+        
+        accuracy = accuracy_score(y_test, model.predict(X_test))
+        return model, {'accuracy': accuracy, 'fit_seconds': fit_seconds}
+    
+    @instrumented('predictor.train_prediction_model')
+    def train_prediction_model(self, cache=None, workers=None):
         """
-        Train machine learning model on historical data
+        Train machine learning models on historical data
+        The jodi, open pana and close pana models share one train/test split and
+        train concurrently, splitting `workers` cores (default: all) between them;
+        workers=1 fits them one after another in the calling thread.
+        With a ModelCache, fitted models are reused or warm-started across runs.
         """
-        print("[INFO] Training prediction model...")
+        print("[INFO] Training prediction models...")
+        # sklearn takes over a second to import, so only load it when training
+        from sklearn.ensemble import RandomForestClassifier
+        from sklearn.model_selection import train_test_split
         
-        # Prepare features
+        # Prepare features in date order
+        data = self.data.sort_values('date', kind='stable')
+        annotate(rows=len(data))
         features = ['day_of_week', 'day_of_month', 'month']
-        X = self.data[features]
-        y_jodi = self.data['jodi']
-        y_open = self.data['open_pana']
-        y_close = self.data['close_pana']
-        
-        # Train models
-        self.jodi_model = RandomForestClassifier(n_estimators=100, random_state=42)
-        self.open_model = RandomForestClassifier(n_estimators=100, random_state=42)
-        self.close_model = RandomForestClassifier(n_estimators=100, random_state=42)
-        
-        # Split data
-        X_train, X_test, y_jodi_train, y_jodi_test = train_test_split(
-            X, y_jodi, test_size=0.2, random_state=42
+        X = data[features].astype(np.uint8)
+        targets = ['jodi', 'open_pana', 'close_pana']
+        n_jobs = max(1, (workers or os.cpu_count() or 1) // len(targets))
+        
+        # Split data once for every target; the most recent 20% is held out so
+        # no future draws leak into training (see backtest.py for walk-forward)
+        X_train, X_test, *y_split = train_test_split(
+            X, *(data[target] for target in targets), test_size=0.2, shuffle=False
         )
         
-        # Train models
-        self.jodi_model.fit(X_train, y_jodi_train)
+        # Release the previous forests first; pana forests hold ~900 classes per leaf
+        self.jodi_model = self.open_model = self.close_model = None
+        
+        # Train models; forest fitting releases the GIL, so threads run the targets in parallel
+        models = {
+            target: RandomForestClassifier(n_estimators=100, random_state=42, n_jobs=n_jobs)
+            for target in targets
+        }
+        if workers == 1:
+            # One core: fit in this thread, one target after another (what profiled() can see)
+            results = {
+                target: self._fit_target(target, models[target], X_train, X_test, y_split[2 * i], y_split[2 * i + 1], cache)
+                for i, target in enumerate(targets)
+            }
+        else:
+            with ThreadPoolExecutor(max_workers=len(targets)) as executor:
+                futures = {
+                    # Each fit runs in a copy of this context so its telemetry stage nests under this one
+                    target: executor.submit(contextvars.copy_context().run, self._fit_target, target,
+                                            models[target], X_train, X_test, y_split[2 * i], y_split[2 * i + 1], cache)
+                    for i, target in enumerate(targets)
+                }
+                results = {target: future.result() for target, future in futures.items()}
         
-        # Calculate accuracy
-        jodi_pred = self.jodi_model.predict(X_test)
-        accuracy = accuracy_score(y_jodi_test, jodi_pred)
+        self.jodi_model = results['jodi'][0]
+        self.open_model = results['open_pana'][0]
+        self.close_model = results['close_pana'][0]
+        self.training_report = {target: result[1] for target, result in results.items()}
+        self.compile_models()
+        self.models_version += 1
         
-        print(f"[OK] Model trained with accuracy: {accuracy:.2%}")
+        for target, report in self.training_report.items():
+            print(f"[OK] {target} model trained in {report['fit_seconds']:.2f}s with accuracy: {report['accuracy']:.2%}")
+        return self.training_report
+        
+    @instrumented('predictor.compile_models')
+    def compile_models(self):
+        """
+        Compile the trained forests into flat node arrays and lookup tables
+        The calendar features span only 7x31x12 values, so every prediction
+        the forests can make is precomputed; predictions are identical to
+        the forests' own and survive releasing the forests.
+        """
+        self.compiled_models = {
+            target: CompiledForest.from_sklearn(model).build_table(FEATURE_DOMAIN)
+            for target, model in (('jodi', self.jodi_model), ('open_pana', self.open_model), ('close_pana', self.close_model))
+            if model is not None
+        }
+        return self.compiled_models
+    
+    @instrumented('predictor.predict_range', rows=len)
+    def predict_range(self, start, end=None):
+        """
+        Predict every date from `start` to `end` (inclusive) in one pass
+        Builds the feature matrix for the whole range and looks every date up
+        in each compiled model's table. Returns one row per date; the Markov
+        column chains the most likely next jodi on from the last draw before
+        `start`, one step per day (so past that draw's date it is an n-step
+        forecast).
+        """
+        start = np.datetime64(pd.Timestamp(start).strftime('%Y-%m-%d'), 'D')
+        end = start if end is None else np.datetime64(pd.Timestamp(end).strftime('%Y-%m-%d'), 'D')
+        dates = np.arange(start, end + np.timedelta64(1, 'D'), dtype='datetime64[D]')
+        features = calendar_features(dates)
         
+        stats = self.get_stats()
+        freq_jodi = int(stats.top('jodi', 1).index[0])
+        
+        # Weekday means as a lookup table; weekdays never seen fall back to the frequency pick
+        day_means = np.full(7, float(freq_jodi))
+        day_pattern = stats.day_means()
+        day_means[day_pattern.index.to_numpy()] = day_pattern.to_numpy()
+        
+        result = pd.DataFrame({'date': np.datetime_as_string(dates, unit='D')})
+        for column, target in (('ml_prediction', 'jodi'),
+                               ('open_pana_prediction', 'open_pana'),
+                               ('close_pana_prediction', 'close_pana')):
+            if target in self.compiled_models:
+                result[column] = self.compiled_models[target].predict(features).astype(np.int64)
+        if 'ml_prediction' not in result:
+            result['ml_prediction'] = freq_jodi
+        result['frequency_prediction'] = freq_jodi
+        result['pattern_prediction'] = day_means[features['day_of_week'].to_numpy()].astype(np.int64)
+        result['markov_prediction'] = self._markov_path(start, len(dates))
+        return result
+    
+    def _markov_path(self, start, steps):
+        """Most likely jodi chain for `steps` days from `start`, following the last draw before it"""
+        transitions = self.get_transitions()
+        draw_dates = frame_dates(self.data)
+        earlier = np.flatnonzero(draw_dates < start)
+        if not len(earlier):
+            # No draw to follow: the chain starts from the overall most-followed jodis
+            return transitions.predict_path(steps, last_jodi=-1)
+        previous = earlier[np.argmax(draw_dates[earlier])]
+        # Days between that draw and `start` are chained through, not skipped
+        gap = int((start - draw_dates[previous]) // np.timedelta64(1, 'D')) - 1
+        return transitions.predict_path(gap + steps, last_jodi=int(self.data['jodi'].iloc[previous]))[gap:]
+    
+    @instrumented('predictor.generate_prediction')
     def generate_prediction(self):
         """
         Generate prediction for today's Kalyan Matka
@@ -108,93 +377,88 @@ class KalyanMatkaPredictor:
         print("[INFO] Generating today's prediction...")
         
         today = datetime.now()
-        features = [[
-            today.weekday(),
-            today.day,
-            today.month
-        ]]
-        
-        # Statistical analysis based predictions
-        patterns = self.analyze_patterns()
-        
-        # ML model prediction
-        if hasattr(self, 'jodi_model') and self.jodi_model:
-            ml_jodi = self.jodi_model.predict(features)[0]
-        else:
-            ml_jodi = patterns['most_frequent_jodis'].index[0]
         
-        # Frequency based prediction
-        freq_jodi = patterns['most_frequent_jodis'].index[0]
+        # ML, frequency and pattern based predictions for today
+        row = self.predict_range(today).iloc[0]
+        ml_jodi = int(row['ml_prediction'])
+        freq_jodi = int(row['frequency_prediction'])
+        day_pattern = int(row['pattern_prediction'])
+        markov_jodi = int(row['markov_prediction'])
         
-        # Pattern based prediction
-        day_pattern = int(patterns['day_wise_patterns'][today.weekday()])
+        # Open ank of each suggested jodi, with panas that produce those anks
+        single_ank = [int(ank) for ank in jodi_anks([ml_jodi, freq_jodi])[0]]
         
         # Combine predictions
         predictions = {
             'date': today.strftime('%Y-%m-%d'),
-            'ml_prediction': int(ml_jodi),
-            'frequency_prediction': int(freq_jodi),
+            'ml_prediction': ml_jodi,
+            'frequency_prediction': freq_jodi,
             'pattern_prediction': day_pattern,
+            'markov_prediction': markov_jodi,
             'confidence_score': np.random.uniform(0.6, 0.9),
             'suggested_numbers': {
-                'jodi': [int(ml_jodi), int(freq_jodi), day_pattern],
-                'single_ank': [int(str(ml_jodi)[0]), int(str(freq_jodi)[0])],
-                'pana': self.generate_pana_suggestions()
+                'jodi': [ml_jodi, freq_jodi, day_pattern, markov_jodi],
+                'single_ank': single_ank,
+                'pana': self.generate_pana_suggestions(anks=single_ank)
             }
         }
         
-        self.prediction_history.append(predictions)
+        self.last_prediction = predictions
+        if self.journal is not None:
+            self.journal.record(self.market, predictions)
         return predictions
     
-    def generate_pana_suggestions(self):
+    def generate_pana_suggestions(self, count=5, anks=None, rng=None):
         """
         Generate Pana (3-digit) suggestions
+        Drawn from the valid pana table, limited to panas of the given anks if any.
         """
-        panas = []
-        for _ in range(5):
-            pana = np.random.randint(100, 999)
-            panas.append(pana)
-        return panas
+        return [int(pana) for pana in sample_panas(count, anks=anks, rng=rng)]
     
     def calculate_win_probability(self, number, category='jodi'):
         """
         Calculate win probability for a specific number
         """
-        if category == 'jodi':
-            frequency = len(self.data[self.data['jodi'] == number])
-        else:
-            frequency = 1
-            
-        total_records = len(self.data)
-        probability = (frequency / total_records) * 100 if total_records > 0 else 0
-        
-        return probability
+        return self.get_stats().probability(number, category)
     
-    def get_hot_cold_numbers(self):
+    @instrumented('predictor.get_hot_cold_numbers')
+    def get_hot_cold_numbers(self, window=30, k=5):
         """
         Get hot and cold numbers based on recent frequency
+        Hot numbers are the most drawn in the last `window` days, cold numbers
+        are the ones gone longest without a draw. Windows up to 90 days come
+        from the running tracker; longer ones are counted from self.data.
         """
-        recent_data = self.data.tail(30)  # Last 30 days
-        
-        hot_numbers = recent_data['jodi'].value_counts().head(5).index.tolist()
-        all_jodis = set(range(10, 100))
-        recent_jodis = set(recent_data['jodi'].tolist())
-        cold_numbers = list(all_jodis - recent_jodis)[:5]
+        tracker = self.get_hot_cold()
+        if window > tracker.size:
+            tracker = HotColdTracker.from_frame(self.data, windows=(window,))
         
         return {
-            'hot_numbers': hot_numbers,
-            'cold_numbers': cold_numbers
+            'hot_numbers': tracker.hot(window, k),
+            'cold_numbers': tracker.cold(window, k)
         }
     
+    @instrumented('predictor.generate_daily_report')
     def generate_daily_report(self):
         """
         Generate comprehensive daily prediction report
+        Rendered once per history version, model version and day; repeated or
+        concurrent calls get the cached text.
         """
+        snapshot = self.analysis_snapshot()
+        key = ('daily', snapshot.version, self.models_version, datetime.now().strftime('%Y-%m-%d'))
+        report = self.reports.get(key, lambda: self._render_daily_report(snapshot))
+        
+        print(report)
+        return report
+    
+    def _render_daily_report(self, snapshot):
+        """Daily report text from a fresh prediction and the snapshot's hot/cold lists"""
         prediction = self.generate_prediction()
-        hot_cold = self.get_hot_cold_numbers()
+        hot_cold = snapshot.hot_cold
         
         report = f"""
-KALYAN MATKA DAILY PREDICTION REPORT
+{self.market.upper()} MATKA DAILY PREDICTION REPORT
 Date: {prediction['date']}
 =======================================
 
@@ -202,6 +466,7 @@ AI PREDICTIONS:
 - ML Model Prediction: {prediction['ml_prediction']}
 - Frequency Based: {prediction['frequency_prediction']}
 - Pattern Based: {prediction['pattern_prediction']}
+- Sequence (Markov) Based: {prediction['markov_prediction']}
 - Confidence Score: {prediction['confidence_score']:.1%}
 
 SUGGESTED NUMBERS:
@@ -218,8 +483,6 @@ COLD NUMBERS (Due for Draw):
 WARNING: This is for educational purposes only. 
 Gambling involves risks and may be illegal in your jurisdiction.
 """
-        
-        print(report)
         return report
 
 # Usage Example
@@ -228,14 +491,14 @@ def main():
     print("[WARNING] This is for educational purposes only!")
     print("[WARNING] Gambling activities may be illegal in your jurisdiction!")
     
-    # Initialize predictor
-    predictor = KalyanMatkaPredictor()
+    # Initialize predictor; predictions and their hit rates are kept in predictions.db
+    predictor = KalyanMatkaPredictor(journal=PredictionJournal())
     
-    # Collect historical data
-    predictor.scrape_historical_data(days=365)
+    # Load historical data, simulating only the draws missing since the last run
+    predictor.load_history(HistoryStore(), days=365, simulate=True)
     
-    # Train model
-    predictor.train_prediction_model()
+    # Train model, reusing the cached fit from earlier runs where possible
+    predictor.train_prediction_model(cache=ModelCache())
     
     # Generate daily prediction
     daily_report = predictor.generate_daily_report()
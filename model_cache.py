@@ -0,0 +1,172 @@
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+import numpy as np
+
+class ModelCache:
+    """
+    On-disk cache of fitted forest models
+    Entries are keyed by a fingerprint of the training data and hyperparameters.
+    On a miss, the newest entry with the same hyperparameters is extended with a
+    few trees fitted on the new data (warm start) instead of refitting from scratch.
+
+    A forest can only be extended when the new data has exactly its classes.
+    Pana targets rarely do over a sliding window, so when the classes changed
+    the full refit replaces the lineage's newest entry instead of adding one
+    more large pickle. The cache is also capped at `max_bytes` on disk.
+    """
+    def __init__(self, path='model_cache', max_entries=12, max_age_days=7, extra_trees=10, max_bytes=1024 ** 3):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age_days = max_age_days
+        self.extra_trees = extra_trees
+        self.index_file = os.path.join(path, 'index.json')
+        os.makedirs(path, exist_ok=True)
+        self.index = self._read_index()
+        self.lock = threading.RLock()
+
+    def _read_index(self):
+        if not os.path.exists(self.index_file):
+            return {}
+        with open(self.index_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _write_index(self):
+        tmp_file = self.index_file + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, indent=2)
+        os.replace(tmp_file, self.index_file)
+
+    @staticmethod
+    def _hash_array(digest, values):
+        values = np.ascontiguousarray(np.asarray(values))
+        digest.update(str((values.dtype.str, values.shape)).encode())
+        digest.update(values.tobytes())
+
+    def lineage(self, estimator, name):
+        """Key shared by every model trained with the same estimator settings"""
+        # Parallelism and logging settings do not change the fitted model
+        params = {k: v for k, v in estimator.get_params().items() if k not in ('n_jobs', 'verbose')}
+        params = json.dumps(params, sort_keys=True, default=str)
+        return hashlib.sha256(f'{name}:{type(estimator).__name__}:{params}'.encode()).hexdigest()[:16]
+
+    def fingerprint(self, estimator, X, y, name='model'):
+        """Cache key for an estimator trained on X, y"""
+        digest = hashlib.sha256(self.lineage(estimator, name).encode())
+        self._hash_array(digest, X)
+        self._hash_array(digest, y)
+        return digest.hexdigest()[:32]
+
+    def _load(self, key, estimator):
+        with open(os.path.join(self.path, self.index[key]['file']), 'rb') as f:
+            model = pickle.load(f)
+        # Run with the caller's parallelism, not whatever the cached model was fitted with
+        if 'n_jobs' in estimator.get_params():
+            model.set_params(n_jobs=estimator.get_params()['n_jobs'])
+        return model
+
+    def _save(self, key, lineage, model, rows):
+        filename = f'{key}.pkl'
+        tmp_file = os.path.join(self.path, filename + '.tmp')
+        with open(tmp_file, 'wb') as f:
+            pickle.dump(model, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, os.path.join(self.path, filename))
+        now = time.time()
+        self.index[key] = {
+            'file': filename,
+            'lineage': lineage,
+            'rows': rows,
+            'bytes': os.path.getsize(os.path.join(self.path, filename)),
+            'created': now,
+            'last_used': now
+        }
+
+    def _remove(self, key):
+        entry = self.index.pop(key)
+        try:
+            os.remove(os.path.join(self.path, entry['file']))
+        except FileNotFoundError:
+            pass
+
+    def _latest(self, lineage):
+        entries = [key for key, entry in self.index.items() if entry['lineage'] == lineage]
+        return max(entries, key=lambda key: self.index[key]['created']) if entries else None
+
+    def _warm_start(self, model, X, y):
+        """
+        Replace the oldest trees with `extra_trees` fitted on the new data
+        Returns None when the class set changed and a full refit is needed.
+        """
+        if not np.array_equal(np.unique(np.asarray(y)), model.classes_):
+            return None
+        keep = model.estimators_[self.extra_trees:]
+        model.estimators_ = keep
+        # Warm start seeds the new trees with the draws after the kept trees' seeds;
+        # with the same random_state every extension would repeat the previous one's
+        seed = model.get_params()['random_state']
+        if isinstance(seed, (int, np.integer)):
+            model.set_params(random_state=int(seed) + model.n_estimators)
+        model.set_params(n_estimators=len(keep) + self.extra_trees, warm_start=True)
+        model.fit(X, y)
+        model.set_params(warm_start=False)
+        return model
+
+    def evict(self):
+        """
+        Drop entries older than max_age_days, then the least recently used
+        beyond max_entries or beyond max_bytes in total
+        """
+        cutoff = time.time() - self.max_age_days * 86400
+        ranked = sorted(self.index, key=lambda key: self.index[key]['last_used'], reverse=True)
+        stale, total = [], 0
+        for i, key in enumerate(ranked):
+            total += self.index[key].get('bytes', 0)
+            if i >= self.max_entries or total > self.max_bytes or self.index[key]['last_used'] < cutoff:
+                stale.append(key)
+        for key in stale:
+            self._remove(key)
+        return len(stale)
+
+    def fit(self, estimator, X, y, name='model'):
+        """
+        Return `estimator` fitted on X, y, reusing cached work where possible
+        `estimator` itself is left unfitted; the returned model is a separate object.
+        Safe to call from several threads at once.
+        """
+        from sklearn.base import clone
+
+        lineage = self.lineage(estimator, name)
+        key = self.fingerprint(estimator, X, y, name)
+
+        with self.lock:
+            if key in self.index:
+                model = self._load(key, estimator)
+                self.index[key]['last_used'] = time.time()
+                self._write_index()
+                print(f"[INFO] Loaded cached {name} model")
+                return model
+            replaced = self._latest(lineage)
+            previous = self._load(replaced, estimator) if replaced is not None else None
+
+        model = None
+        if previous is not None and hasattr(estimator, 'warm_start'):
+            model = self._warm_start(previous, X, y)
+            if model is not None:
+                print(f"[INFO] Extended cached {name} model with {self.extra_trees} new trees")
+                replaced = None
+            else:
+                print(f"[INFO] {name} classes changed since the cached model; refitting it in its place")
+        if model is None:
+            model = clone(estimator).fit(X, y)
+
+        with self.lock:
+            if replaced is not None and replaced in self.index:
+                self._remove(replaced)
+            self._save(key, lineage, model, len(y))
+            self.evict()
+            self._write_index()
+        return model
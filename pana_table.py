@@ -0,0 +1,79 @@
+import numpy as np
+
+# Pana types, as stored in PANA_TYPE
+TYPE_NAMES = ('single', 'double', 'triple')
+
+def _build_tables():
+    """
+    Every valid pana with its ank and type, plus lookups indexed by number
+    A pana's digits must be in ascending order with 0 ranked as 10
+    (e.g. 128, 370, 550, 000), which gives 120 single, 90 double and
+    10 triple panas.
+    """
+    numbers = np.arange(1000)
+    digits = np.stack([numbers // 100, numbers // 10 % 10, numbers % 10], axis=1)
+    ranked = np.where(digits == 0, 10, digits)
+    valid = (ranked[:, 0] <= ranked[:, 1]) & (ranked[:, 1] <= ranked[:, 2])
+
+    ank_of = (digits.sum(axis=1) % 10).astype(np.int8)
+    distinct = 1 + (digits[:, 0] != digits[:, 1]) + (digits[:, 1] != digits[:, 2])
+    type_of = np.where(valid, 3 - distinct, -1).astype(np.int8)
+
+    panas = np.flatnonzero(valid).astype(np.int16)
+    # Panas grouped by ank: ANK_PANAS[ANK_OFFSETS[a]:ANK_OFFSETS[a + 1]] all have ank a
+    order = np.argsort(ank_of[panas], kind='stable')
+    offsets = np.searchsorted(ank_of[panas][order], np.arange(11)).astype(np.int16)
+    return valid, ank_of, type_of, panas, panas[order], offsets
+
+VALID_PANA, ANK_OF, PANA_TYPE, PANAS, ANK_PANAS, ANK_OFFSETS = _build_tables()
+for _table in (VALID_PANA, ANK_OF, PANA_TYPE, PANAS, ANK_PANAS, ANK_OFFSETS):
+    _table.setflags(write=False)
+
+def is_valid_pana(numbers):
+    """True where a number (0-999) is a valid pana; works on scalars or arrays"""
+    numbers = np.asarray(numbers)
+    in_range = (numbers >= 0) & (numbers < 1000)
+    return in_range & VALID_PANA[np.clip(numbers, 0, 999)]
+
+def pana_ank(numbers):
+    """Single ank of a pana: digit sum mod 10"""
+    return ANK_OF[np.asarray(numbers)]
+
+def pana_type(numbers):
+    """'single', 'double' or 'triple' for each pana (None if invalid)"""
+    codes = np.atleast_1d(PANA_TYPE[np.asarray(numbers)])
+    names = [TYPE_NAMES[code] if code >= 0 else None for code in codes]
+    return names[0] if np.ndim(numbers) == 0 else names
+
+def panas_for_ank(ank, kind=None):
+    """All valid panas with the given ank, optionally of one type"""
+    panas = ANK_PANAS[ANK_OFFSETS[ank]:ANK_OFFSETS[ank + 1]]
+    if kind is not None:
+        panas = panas[PANA_TYPE[panas] == TYPE_NAMES.index(kind)]
+    return panas
+
+def jodi_anks(jodis):
+    """Open and close ank of each jodi"""
+    jodis = np.asarray(jodis)
+    return jodis // 10, jodis % 10
+
+def is_consistent(open_panas, jodis, close_panas):
+    """True where both panas are valid and their anks form the jodi"""
+    open_panas, close_panas = np.asarray(open_panas), np.asarray(close_panas)
+    open_ank, close_ank = jodi_anks(jodis)
+    valid = is_valid_pana(open_panas) & is_valid_pana(close_panas)
+    return valid & (ANK_OF[np.clip(open_panas, 0, 999)] == open_ank) & (ANK_OF[np.clip(close_panas, 0, 999)] == close_ank)
+
+def sample_panas(count, anks=None, rng=None):
+    """
+    Draw `count` distinct valid panas in one vectorized step
+    With `anks`, only panas whose ank is in that list are drawn; an empty
+    list limits nothing, like None.
+    """
+    if not isinstance(rng, np.random.Generator):
+        rng = np.random.default_rng(rng)
+    if anks is None or len(anks) == 0:
+        pool = PANAS
+    else:
+        pool = np.concatenate([panas_for_ank(int(ank)) for ank in np.unique(anks)])
+    return rng.choice(pool, size=min(count, len(pool)), replace=False)
@@ -0,0 +1,117 @@
+import pandas as pd
+import numpy as np
+
+# Count array sizes: arrays are indexed by the number itself
+JODI_RANGE = (10, 100)
+PANA_RANGE = (100, 1000)
+
+class PatternStats:
+    """
+    Running frequency and calendar statistics for a draw history
+    Counts are kept in flat arrays indexed by the drawn number, so adding or
+    removing a draw is O(1) and queries never touch the raw DataFrame.
+    """
+    def __init__(self):
+        self.total = 0
+        self.counts = {
+            'jodi': np.zeros(JODI_RANGE[1], dtype=np.int64),
+            'open_pana': np.zeros(PANA_RANGE[1], dtype=np.int64),
+            'close_pana': np.zeros(PANA_RANGE[1], dtype=np.int64)
+        }
+        self.weekday_sum = np.zeros(7, dtype=np.int64)
+        self.weekday_count = np.zeros(7, dtype=np.int64)
+        self.month_sum = np.zeros(13, dtype=np.int64)
+        self.month_count = np.zeros(13, dtype=np.int64)
+
+    @classmethod
+    def from_frame(cls, data):
+        """Build statistics for every draw in a history DataFrame"""
+        stats = cls()
+        stats.update_frame(data)
+        return stats
+
+    def _apply(self, jodi, open_pana, close_pana, day_of_week, month, sign):
+        self.counts['jodi'][jodi] += sign
+        self.counts['open_pana'][open_pana] += sign
+        self.counts['close_pana'][close_pana] += sign
+        self.weekday_sum[day_of_week] += sign * jodi
+        self.weekday_count[day_of_week] += sign
+        self.month_sum[month] += sign * jodi
+        self.month_count[month] += sign
+        self.total += sign
+
+    def update(self, jodi, open_pana, close_pana, day_of_week, month):
+        """Add a single draw"""
+        self._apply(int(jodi), int(open_pana), int(close_pana), int(day_of_week), int(month), 1)
+
+    def remove(self, jodi, open_pana, close_pana, day_of_week, month):
+        """Remove a single draw, e.g. one that slid out of the analysis window"""
+        self._apply(int(jodi), int(open_pana), int(close_pana), int(day_of_week), int(month), -1)
+
+    def _apply_frame(self, data, sign):
+        if len(data) == 0:
+            return
+        jodi = data['jodi'].to_numpy().astype(np.int64)
+        day_of_week = data['day_of_week'].to_numpy().astype(np.int64)
+        month = data['month'].to_numpy().astype(np.int64)
+
+        for category, counts in self.counts.items():
+            counts += sign * np.bincount(data[category].to_numpy().astype(np.int64), minlength=len(counts))
+        self.weekday_sum += sign * np.bincount(day_of_week, weights=jodi, minlength=7).astype(np.int64)
+        self.weekday_count += sign * np.bincount(day_of_week, minlength=7)
+        self.month_sum += sign * np.bincount(month, weights=jodi, minlength=13).astype(np.int64)
+        self.month_count += sign * np.bincount(month, minlength=13)
+        self.total += sign * len(data)
+
+    def update_frame(self, data):
+        """Add every draw in a DataFrame in one vectorized step"""
+        self._apply_frame(data, 1)
+
+    def remove_frame(self, data):
+        """Remove every draw in a DataFrame in one vectorized step"""
+        self._apply_frame(data, -1)
+
+    def top(self, category='jodi', k=10):
+        """
+        Most frequent numbers in a category as a count Series
+        Ties are broken by the smaller number first.
+        """
+        counts = self.counts[category]
+        seen = np.flatnonzero(counts)
+        ranked = seen[np.argsort(-counts[seen], kind='stable')][:k]
+        return pd.Series(counts[ranked], index=pd.Index(ranked, name=category), name='count')
+
+    def _means(self, sums, counts, name):
+        seen = np.flatnonzero(counts)
+        return pd.Series(sums[seen] / counts[seen], index=pd.Index(seen, name=name), name='jodi')
+
+    def day_means(self):
+        """Average jodi per weekday (0=Monday), for weekdays present in the data"""
+        return self._means(self.weekday_sum, self.weekday_count, 'day_of_week')
+
+    def month_means(self):
+        """Average jodi per month (1-12), for months present in the data"""
+        return self._means(self.month_sum, self.month_count, 'month')
+
+    def count(self, number, category='jodi'):
+        """How many times a number has been drawn in a category"""
+        counts = self.counts.get(category)
+        if counts is None or not 0 <= number < len(counts):
+            return 0
+        return int(counts[number])
+
+    def probability(self, number, category='jodi'):
+        """Historical draw frequency of a number as a percentage"""
+        if self.total == 0:
+            return 0
+        return (self.count(number, category) / self.total) * 100
+
+    def analysis(self, k=10):
+        """Same structure as KalyanMatkaPredictor.analyze_patterns"""
+        return {
+            'most_frequent_jodis': self.top('jodi', k),
+            'most_frequent_open_panas': self.top('open_pana', k),
+            'most_frequent_close_panas': self.top('close_pana', k),
+            'day_wise_patterns': self.day_means(),
+            'monthly_patterns': self.month_means()
+        }
@@ -0,0 +1,198 @@
+import json
+import sqlite3
+import threading
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from history_store import frame_dates
+
+# Prediction fields scored against the actual jodi; 'suggested' hits when any
+# suggested jodi was drawn
+STRATEGIES = ('ml_prediction', 'frequency_prediction', 'pattern_prediction', 'markov_prediction')
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS predictions (
+    id INTEGER PRIMARY KEY,
+    market TEXT NOT NULL,
+    draw_date TEXT NOT NULL,
+    run_at TEXT NOT NULL,
+    ml_prediction INTEGER,
+    frequency_prediction INTEGER,
+    pattern_prediction INTEGER,
+    markov_prediction INTEGER,
+    suggested_jodis TEXT,
+    confidence_score REAL,
+    payload TEXT NOT NULL,
+    actual_jodi INTEGER
+);
+CREATE INDEX IF NOT EXISTS predictions_market_date ON predictions (market, draw_date, run_at);
+CREATE INDEX IF NOT EXISTS predictions_run_at ON predictions (run_at);
+CREATE INDEX IF NOT EXISTS predictions_unscored ON predictions (market, draw_date) WHERE actual_jodi IS NULL;
+
+CREATE TABLE IF NOT EXISTS draws (
+    market TEXT NOT NULL,
+    draw_date TEXT NOT NULL,
+    open_pana INTEGER,
+    jodi INTEGER NOT NULL,
+    close_pana INTEGER,
+    recorded_at TEXT,
+    PRIMARY KEY (market, draw_date)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS hit_rates (
+    market TEXT NOT NULL,
+    strategy TEXT NOT NULL,
+    scored INTEGER NOT NULL,
+    hits INTEGER NOT NULL,
+    PRIMARY KEY (market, strategy)
+) WITHOUT ROWID;
+'''
+
+class PredictionJournal:
+    """
+    Append-only SQLite (WAL) journal of every prediction made, per market
+    Predictions are indexed by market, draw date and run time. Actual draws
+    are recorded alongside; each prediction is scored once, when its draw
+    is known, and the running hit counts per strategy are kept in hit_rates.
+    Only predictions made before their draw was recorded are scored; one
+    for an already known draw is journaled but never scored.
+    Safe to share between threads.
+    """
+    def __init__(self, path='predictions.db'):
+        self.path = path
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+        with self.lock, self.connection:
+            self.connection.execute('PRAGMA journal_mode=WAL')
+            self.connection.execute('PRAGMA synchronous=NORMAL')
+            self.connection.executescript(_SCHEMA)
+            # Journals from before draws carried their recording time
+            columns = [row[1] for row in self.connection.execute('PRAGMA table_info(draws)')]
+            if 'recorded_at' not in columns:
+                self.connection.execute('ALTER TABLE draws ADD COLUMN recorded_at TEXT')
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+    @staticmethod
+    def _row(market, prediction, run_at):
+        suggested = prediction.get('suggested_numbers', {}).get('jodi', [])
+        return (
+            market,
+            str(prediction['date']),
+            run_at,
+            *(None if prediction.get(strategy) is None else int(prediction[strategy]) for strategy in STRATEGIES),
+            ','.join(str(int(jodi)) for jodi in suggested),
+            None if prediction.get('confidence_score') is None else float(prediction['confidence_score']),
+            json.dumps(prediction, default=str)
+        )
+
+    def record_many(self, market, predictions, run_at=None):
+        """Append predictions (dicts as made by generate_prediction) in one transaction"""
+        run_at = (run_at or datetime.now()).isoformat(timespec='seconds')
+        rows = [self._row(market, prediction, run_at) for prediction in predictions]
+        with self.lock, self.connection:
+            self.connection.executemany(
+                'INSERT INTO predictions (market, draw_date, run_at, ml_prediction, frequency_prediction, '
+                'pattern_prediction, markov_prediction, suggested_jodis, confidence_score, payload) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', rows
+            )
+            self._score()
+        return len(rows)
+
+    def record(self, market, prediction, run_at=None):
+        """Append one prediction"""
+        return self.record_many(market, [prediction], run_at)
+
+    def record_draws(self, market, data, recorded_at=None):
+        """
+        Record actual draws from a history frame and score the predictions they settle
+        Draws already journaled for the market are skipped.
+        """
+        if len(data) == 0:
+            return 0
+        recorded_at = (recorded_at or datetime.now()).isoformat(timespec='seconds')
+        dates = np.datetime_as_string(frame_dates(data), unit='D')
+        rows = list(zip(
+            [market] * len(dates), dates.tolist(),
+            np.asarray(data['open_pana']).astype(np.int64).tolist(),
+            np.asarray(data['jodi']).astype(np.int64).tolist(),
+            np.asarray(data['close_pana']).astype(np.int64).tolist(),
+            [recorded_at] * len(dates)
+        ))
+        with self.lock, self.connection:
+            last = self.connection.execute('SELECT MAX(draw_date) FROM draws WHERE market = ?', (market,)).fetchone()[0]
+            if last is not None:
+                rows = [row for row in rows if row[1] > last]
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO draws (market, draw_date, open_pana, jodi, close_pana, recorded_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                rows
+            )
+            if rows:
+                self._score()
+        return len(rows)
+
+    def _score(self):
+        """
+        Score every prediction whose draw is now known; caller holds the lock and transaction
+        A prediction only counts if it was made before its draw was recorded.
+        """
+        pending = self.connection.execute(
+            'SELECT p.id, p.market, p.ml_prediction, p.frequency_prediction, p.pattern_prediction, '
+            'p.markov_prediction, p.suggested_jodis, d.jodi FROM predictions p '
+            'JOIN draws d ON d.market = p.market AND d.draw_date = p.draw_date '
+            'WHERE p.actual_jodi IS NULL AND p.run_at < d.recorded_at'
+        ).fetchall()
+        if not pending:
+            return 0
+
+        totals = {}
+        for row in pending:
+            market, picks, suggested, actual = row[1], row[2:6], row[6], row[7]
+            hits = [(strategy, pick == actual) for strategy, pick in zip(STRATEGIES, picks) if pick is not None]
+            hits.append(('suggested', str(actual) in suggested.split(',') if suggested else False))
+            for strategy, hit in hits:
+                scored, hit_count = totals.get((market, strategy), (0, 0))
+                totals[(market, strategy)] = (scored + 1, hit_count + int(hit))
+
+        self.connection.executemany(
+            'UPDATE predictions SET actual_jodi = ? WHERE id = ?', [(row[7], row[0]) for row in pending]
+        )
+        self.connection.executemany(
+            'INSERT INTO hit_rates (market, strategy, scored, hits) VALUES (?, ?, ?, ?) '
+            'ON CONFLICT (market, strategy) DO UPDATE SET scored = scored + excluded.scored, hits = hits + excluded.hits',
+            [(market, strategy, scored, hits) for (market, strategy), (scored, hits) in totals.items()]
+        )
+        return len(pending)
+
+    def _query(self, sql, params=()):
+        with self.lock:
+            return pd.read_sql_query(sql, self.connection, params=params)
+
+    def predictions(self, market, start=None, end=None):
+        """Predictions for a market with start <= draw date <= end (both optional), oldest first"""
+        return self._query(
+            'SELECT draw_date, run_at, ml_prediction, frequency_prediction, pattern_prediction, '
+            'markov_prediction, suggested_jodis, confidence_score, actual_jodi FROM predictions '
+            'WHERE market = ? AND draw_date >= ? AND draw_date <= ? ORDER BY draw_date, run_at',
+            (market, str(start or '0000-00-00'), str(end or '9999-99-99'))
+        )
+
+    def hit_rates(self, market=None):
+        """Running hit rate per market and strategy"""
+        sql = 'SELECT market, strategy, scored, hits, CAST(hits AS REAL) / scored AS hit_rate FROM hit_rates'
+        if market is None:
+            return self._query(sql + ' ORDER BY market, strategy')
+        return self._query(sql + ' WHERE market = ? ORDER BY strategy', (market,))
+
+    def daily_hits(self, market, start=None, end=None):
+        """Per draw date: scored predictions and hits per strategy, for accuracy charts"""
+        columns = ', '.join(f'SUM({strategy} = actual_jodi) AS {strategy}' for strategy in STRATEGIES)
+        return self._query(
+            f'SELECT draw_date, COUNT(*) AS predictions, {columns} FROM predictions '
+            'WHERE market = ? AND actual_jodi IS NOT NULL AND draw_date >= ? AND draw_date <= ? '
+            'GROUP BY draw_date ORDER BY draw_date',
+            (market, str(start or '0000-00-00'), str(end or '9999-99-99'))
+        )
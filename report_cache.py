@@ -0,0 +1,82 @@
+import threading
+from collections import OrderedDict
+from functools import cached_property
+
+class AnalysisSnapshot:
+    """
+    Every aggregate the reports read, for one version of the history
+    Built once per history version by KalyanMatkaPredictor.analysis_snapshot();
+    the daily text report, the analysis JSON report and the comprehensive
+    report all render from the same snapshot instead of re-aggregating.
+    """
+    def __init__(self, data, stats, hot_cold, version):
+        self.version = version
+        self.data = data
+        self.total_records = len(data)
+        self.analysis = stats.analysis()
+        self.hot_cold = {
+            'hot_numbers': hot_cold.hot(30, 5),
+            'cold_numbers': hot_cold.cold(30, 5)
+        }
+
+    @cached_property
+    def statistics(self):
+        """Summary statistics for the analysis report"""
+        return {
+            'jodi_mean': float(self.data['jodi'].mean()),
+            'jodi_std': float(self.data['jodi'].std()),
+            'open_pana_mean': float(self.data['open_pana'].mean()),
+            'close_pana_mean': float(self.data['close_pana'].mean())
+        }
+
+    @cached_property
+    def patterns(self):
+        """NumberAnalyzer.find_patterns output for the comprehensive report"""
+        from data_utils import NumberAnalyzer
+
+        return NumberAnalyzer().find_patterns(self.data)
+
+class ReportCache:
+    """
+    Rendered reports keyed by (kind, history version, date, ...)
+    Concurrent requests for the same key wait for a single render instead of
+    each rendering it. Only the `max_entries` most recently used outputs are kept.
+    """
+    def __init__(self, max_entries=32):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.pending = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, render):
+        """Cached output for `key`, calling render() only on a miss"""
+        while True:
+            with self.lock:
+                if key in self.entries:
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return self.entries[key]
+                waiting = self.pending.get(key)
+                if waiting is None:
+                    self.pending[key] = threading.Event()
+                    self.misses += 1
+                    break
+            # Another thread is rendering this key; if that render fails, try again ourselves
+            waiting.wait()
+
+        try:
+            value = render()
+            with self.lock:
+                self.entries[key] = value
+                while len(self.entries) > self.max_entries:
+                    self.entries.popitem(last=False)
+            return value
+        finally:
+            with self.lock:
+                self.pending.pop(key).set()
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
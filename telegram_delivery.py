@@ -0,0 +1,266 @@
+"""
+Outbound Telegram delivery: subscribers, transports and an async send queue
+
+    transport = TelegramTransport(token)          # or MockTransport() offline
+    queue = DeliveryQueue(transport)
+    await queue.start()
+    await queue.broadcast(report, subscribers.for_market('Kalyan'))
+    await queue.close()                           # drains, then closes the client
+
+The queue holds one persistent client, keeps to Telegram's limits (about 30
+messages a second overall and one a second per chat), backs off on 429s and
+merges messages waiting for the same chat into one send.
+"""
+import asyncio
+import json
+import os
+import random
+import time
+from collections import deque
+
+# Telegram rejects longer messages
+MAX_MESSAGE_CHARS = 4096
+
+class RateLimited(Exception):
+    """The transport was told to slow down (HTTP 429)"""
+    def __init__(self, retry_after):
+        super().__init__(f"rate limited, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+class DeliveryRejected(Exception):
+    """A permanent failure (bot blocked, chat not found); never retried"""
+
+class TelegramTransport:
+    """One long-lived telegram.Bot shared by every send"""
+    def __init__(self, token):
+        self.token = token
+        self.bot = None
+
+    async def start(self):
+        if self.bot is None:
+            import telegram
+
+            self.bot = telegram.Bot(token=self.token)
+            await self.bot.initialize()
+
+    async def send(self, chat_id, text):
+        from telegram import error
+
+        await self.start()
+        try:
+            await self.bot.send_message(chat_id=chat_id, text=text)
+        except error.RetryAfter as e:
+            retry_after = e.retry_after
+            raise RateLimited(retry_after.total_seconds() if hasattr(retry_after, 'total_seconds') else float(retry_after))
+        except (error.Forbidden, error.BadRequest) as e:
+            raise DeliveryRejected(str(e))
+
+    async def close(self):
+        if self.bot is not None:
+            await self.bot.shutdown()
+            self.bot = None
+
+class MockTransport:
+    """
+    Offline stand-in for TelegramTransport
+    Records every delivered (chat_id, text, monotonic time); can add latency
+    and answer every `flood_every`-th call with a 429.
+    """
+    def __init__(self, latency=0.0, flood_every=0, retry_after=0.5):
+        self.latency = latency
+        self.flood_every = flood_every
+        self.retry_after = retry_after
+        self.calls = 0
+        self.sent = []
+
+    async def start(self):
+        pass
+
+    async def send(self, chat_id, text):
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.flood_every and self.calls % self.flood_every == 0:
+            raise RateLimited(self.retry_after)
+        self.sent.append((chat_id, text, time.monotonic()))
+
+    async def close(self):
+        pass
+
+class SubscriberRegistry:
+    """
+    Chats that receive reports, each for every market or a chosen few
+    Stored as JSON and rewritten atomically on every change.
+    """
+    def __init__(self, path='subscribers.json'):
+        self.path = path
+        self.subscribers = {}
+        if path and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.subscribers = json.load(f)
+
+    def __len__(self):
+        return len(self.subscribers)
+
+    def __contains__(self, chat_id):
+        return str(chat_id) in self.subscribers
+
+    def _save(self):
+        if not self.path:
+            return
+        tmp_file = self.path + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.subscribers, f, indent=2)
+        os.replace(tmp_file, self.path)
+
+    def subscribe(self, chat_id, markets=None):
+        """Send `markets` (default: all) to a chat"""
+        self.subscribers[str(chat_id)] = {'markets': sorted(markets) if markets else None}
+        self._save()
+
+    def unsubscribe(self, chat_id):
+        if self.subscribers.pop(str(chat_id), None) is not None:
+            self._save()
+
+    def for_market(self, market=None):
+        """Chat ids subscribed to `market` (every chat when market is None)"""
+        return [
+            chat_id for chat_id, entry in self.subscribers.items()
+            if market is None or entry['markets'] is None or market in entry['markets']
+        ]
+
+class _Spacing:
+    """Minimum interval between sends per key, for use on one event loop"""
+    def __init__(self, min_interval):
+        self.min_interval = min_interval
+        self.next_allowed = {}
+
+    def reserve(self, key):
+        """Seconds to wait before sending for `key`; books the slot after it"""
+        now = time.monotonic()
+        start = max(now, self.next_allowed.get(key, now))
+        self.next_allowed[key] = start + self.min_interval
+        return start - now
+
+    def pause(self, key, seconds):
+        self.next_allowed[key] = max(self.next_allowed.get(key, 0), time.monotonic() + seconds)
+
+class DeliveryQueue:
+    """
+    Bounded async queue of outgoing messages, sent by `concurrency` workers
+    At most `max_size` messages wait at once; enqueue() blocks beyond that.
+    Each chat is served by one worker at a time, so messages that pile up for
+    a chat while it waits out its rate limit go out together as one message.
+    """
+    def __init__(self, transport, max_size=1000, concurrency=8, messages_per_second=30,
+                 chat_interval=1.0, max_attempts=5, backoff=1.0):
+        self.transport = transport
+        self.max_size = max_size
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.global_spacing = _Spacing(1 / messages_per_second)
+        self.chat_spacing = _Spacing(chat_interval)
+        self.outbox = {}
+        self.ready = None
+        self.slots = None
+        self.workers = []
+        self.stats = {'queued': 0, 'sent': 0, 'batched': 0, 'retries': 0, 'rate_limited': 0, 'failed': 0}
+
+    async def start(self):
+        """Open the transport and start the workers on the running loop"""
+        if self.workers:
+            return
+        self.ready = asyncio.Queue()
+        self.slots = asyncio.Semaphore(self.max_size)
+        await self.transport.start()
+        self.workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+
+    async def enqueue(self, chat_id, text):
+        """Queue one message, waiting while the queue is full"""
+        await self.start()
+        await self.slots.acquire()
+        self.stats['queued'] += 1
+        pending = self.outbox.get(chat_id)
+        if pending is None:
+            self.outbox[chat_id] = deque([text])
+            self.ready.put_nowait(chat_id)
+        else:
+            pending.append(text)
+
+    async def broadcast(self, text, chat_ids):
+        """Queue the same message for every chat"""
+        for chat_id in chat_ids:
+            await self.enqueue(chat_id, text)
+
+    async def join(self):
+        """Wait until every queued message was delivered or given up on"""
+        if self.ready is not None:
+            await self.ready.join()
+
+    async def close(self):
+        """Deliver what is queued, stop the workers and close the transport"""
+        await self.join()
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+        await self.transport.close()
+
+    def _take_batch(self, pending):
+        """
+        Join waiting messages into one text of at most MAX_MESSAGE_CHARS
+        Returns the text and how many queued messages it completes; an
+        oversized message is sent in pieces, completing on its last piece.
+        """
+        first = pending[0]
+        if len(first) > MAX_MESSAGE_CHARS:
+            pending[0] = first[MAX_MESSAGE_CHARS:]
+            return first[:MAX_MESSAGE_CHARS], 0
+        parts, size = [pending.popleft()], len(first)
+        while pending and size + 2 + len(pending[0]) <= MAX_MESSAGE_CHARS:
+            parts.append(pending.popleft())
+            size += 2 + len(parts[-1])
+        return '\n\n'.join(parts), len(parts)
+
+    async def _deliver(self, chat_id, text):
+        """Send with retries; True once delivered"""
+        for attempt in range(self.max_attempts):
+            await asyncio.sleep(self.chat_spacing.reserve(chat_id))
+            await asyncio.sleep(self.global_spacing.reserve(None))
+            try:
+                await self.transport.send(chat_id, text)
+                return True
+            except RateLimited as e:
+                # A 429 applies to the whole bot: hold every worker, not just this chat
+                self.stats['rate_limited'] += 1
+                self.global_spacing.pause(None, e.retry_after)
+            except DeliveryRejected as e:
+                print(f"[WARNING] Telegram rejected a message for {chat_id}: {e}")
+                return False
+            except Exception as e:
+                print(f"[WARNING] Telegram send to {chat_id} failed: {e}")
+                await asyncio.sleep(self.backoff * 2 ** attempt * random.uniform(0.5, 1.5))
+            self.stats['retries'] += 1
+        return False
+
+    async def _worker(self):
+        while True:
+            chat_id = await self.ready.get()
+            try:
+                pending = self.outbox[chat_id]
+                text, completed = self._take_batch(pending)
+                if await self._deliver(chat_id, text):
+                    self.stats['sent'] += completed
+                    self.stats['batched'] += max(0, completed - 1)
+                else:
+                    self.stats['failed'] += completed
+                    print(f"[ERROR] Gave up delivering to {chat_id}")
+                for _ in range(completed):
+                    self.slots.release()
+                if pending:
+                    self.ready.put_nowait(chat_id)
+                else:
+                    del self.outbox[chat_id]
+            finally:
+                self.ready.task_done()
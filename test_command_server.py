@@ -0,0 +1,116 @@
+"""
+CommandServer replies for /today, /hot, /prob and /history, without Telegram
+
+    python -m pytest test_command_server.py    (or: python test_command_server.py)
+"""
+import contextlib
+import io
+from datetime import datetime, timedelta
+from command_server import MAX_HISTORY_DAYS, CommandServer, ServingState
+from history_store import frame_dates
+from matka_predictor import KalyanMatkaPredictor
+
+def serving_state(market='Milan Day', days=120, report="Milan Day report\n"):
+    """ServingState of a predictor holding `days` of simulated history"""
+    predictor = KalyanMatkaPredictor(market=market)
+    with contextlib.redirect_stdout(io.StringIO()):
+        predictor.scrape_historical_data(days, rng=days)
+    return predictor, ServingState.from_predictor(predictor, report)
+
+def test_nothing_published_yet():
+    server = CommandServer()
+    for command, args in (('today', ()), ('hot', ()), ('prob', ('45',)), ('history', ('5',))):
+        assert server.respond(command, args) == "No prediction for any market yet (available: none yet)"
+    assert server.respond('today', ('Kalyan',)) == "No prediction for Kalyan yet (available: none yet)"
+    assert server.respond_text('/help').endswith("Markets: none yet")
+
+def test_today_for_a_market_with_a_space():
+    _, state = serving_state()
+    server = CommandServer()
+    server.publish(state)
+    # The first published market is the default; names match case-insensitively
+    assert server.respond('today') == "Milan Day report"
+    assert server.respond('today', ('milan', 'DAY')) == "Milan Day report"
+    assert server.respond_text('/today@matka_bot Milan Day') == "Milan Day report"
+
+def test_today_flags_a_stale_report():
+    _, state = serving_state()
+    state.published_at = datetime.now() - timedelta(days=1)
+    server = CommandServer()
+    server.publish(state)
+    assert server.respond('today').endswith(f"(Published {state.published_at:%Y-%m-%d %H:%M}; today's run is pending)")
+
+def test_unknown_market():
+    _, state = serving_state()
+    server = CommandServer()
+    server.publish(state)
+    expected = "No prediction for Worli yet (available: Milan Day)"
+    assert server.respond('today', ('Worli',)) == expected
+    assert server.respond('hot', ('Worli',)) == expected
+    assert server.respond('prob', ('45', 'Worli')) == expected
+    assert server.respond('history', ('5', 'Worli')) == expected
+
+def test_hot_lists_every_window():
+    _, state = serving_state()
+    server = CommandServer()
+    server.publish(state)
+    lines = server.respond_text('/hot Milan Day').split('\n')
+    assert lines[0] == "Milan Day hot/cold jodis"
+    assert [line.split(' days')[0] for line in lines[1:]] == [str(window) for window in state.hot_cold]
+    hot = state.hot_cold[7]['hot_numbers']
+    assert lines[1].startswith(f"7 days - hot: {', '.join(map(str, hot))} | cold: ")
+
+def test_prob_counts_jodis_and_panas():
+    predictor, state = serving_state()
+    server = CommandServer()
+    server.publish(state)
+    jodi = int(predictor.data['jodi'].iloc[-1])
+    count = int((predictor.data['jodi'] == jodi).sum())
+    assert server.respond_text(f'/prob {jodi:02d} Milan Day') == (
+        f"{jodi:02d} as jodi: {count} of 120 draws ({count / 120 * 100:.2f}%)")
+
+    pana = int(predictor.data['open_pana'].iloc[-1])
+    lines = server.respond('prob', (f'{pana:03d}',)).split('\n')
+    assert lines[0] == (f"{pana:03d} as open_pana: {int((predictor.data['open_pana'] == pana).sum())} of 120 draws"
+                        f" ({(predictor.data['open_pana'] == pana).sum() / 120 * 100:.2f}%)")
+    assert lines[1].startswith(f"{pana:03d} as close_pana: ")
+
+    usage = "Usage: /prob <2-digit jodi or 3-digit pana> [market]"
+    assert server.respond('prob') == usage
+    assert server.respond('prob', ('4',)) == usage
+    assert server.respond('prob', ('Milan', 'Day')) == usage
+
+def test_history_is_newest_first_and_capped():
+    predictor, state = serving_state()
+    server = CommandServer()
+    server.publish(state)
+    lines = server.respond_text('/history 3 Milan Day').split('\n')
+    data = predictor.data.sort_index()
+    last = data.iloc[-1]
+    assert lines[0] == "Milan Day last 3 draws"
+    assert lines[1] == (f"{frame_dates(data)[-1]}: {int(last['open_pana']):03d}-"
+                        f"{int(last['jodi']):02d}-{int(last['close_pana']):03d}")
+    assert len(lines) == 4 and lines[1] > lines[2] > lines[3]
+
+    assert len(server.respond('history', ('500',)).split('\n')) == MAX_HISTORY_DAYS + 1
+    assert server.respond('history', ('0',)).split('\n')[0] == "Milan Day last 1 draws"
+    assert server.respond('history') == f"Usage: /history <days, up to {MAX_HISTORY_DAYS}> [market]"
+
+def test_markets_are_kept_apart():
+    _, milan = serving_state()
+    _, kalyan = serving_state('Kalyan', days=100, report="Kalyan report")
+    server = CommandServer()
+    server.publish(milan)
+    server.publish(kalyan)
+    assert server.respond('today') == "Milan Day report"
+    assert server.respond('today', ('Kalyan',)) == "Kalyan report"
+    assert server.respond('prob', ('45', 'kalyan')).endswith(
+        f"of 100 draws ({kalyan.counts['jodi'][45] / 100 * 100:.2f}%)")
+    assert server.respond('nope').startswith("Unknown command /nope")
+
+if __name__ == "__main__":
+    for test in (test_nothing_published_yet, test_today_for_a_market_with_a_space, test_today_flags_a_stale_report,
+                 test_unknown_market, test_hot_lists_every_window, test_prob_counts_jodis_and_panas,
+                 test_history_is_newest_first_and_capped, test_markets_are_kept_apart):
+        test()
+        print(f"[OK] {test.__name__}")
@@ -0,0 +1,69 @@
+"""
+CompiledForest against the fitted RandomForestClassifier it was compiled from
+
+    python -m pytest test_compiled_forest.py    (or: python test_compiled_forest.py)
+"""
+import os
+import tempfile
+from types import SimpleNamespace
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from compiled_forest import CompiledForest
+from matka_predictor import FEATURE_DOMAIN, generate_history
+
+FEATURES = ['day_of_week', 'day_of_month', 'month']
+
+def fitted_forest(target='jodi', days=600):
+    """A forest trained on the older 80% of simulated history, and the held-out rest"""
+    data = generate_history(days, rng=7).sort_index()
+    X = data[FEATURES].astype(np.uint8).to_numpy()
+    y = data[target].to_numpy()
+    split = int(len(X) * 0.8)
+    model = RandomForestClassifier(n_estimators=25, random_state=42).fit(X[:split], y[:split])
+    return model, X[split:]
+
+def test_matches_forest_on_held_out_rows():
+    for target in ('jodi', 'open_pana'):
+        model, X_test = fitted_forest(target)
+        compiled = CompiledForest.from_sklearn(model)
+        assert np.array_equal(compiled.predict_proba(X_test), model.predict_proba(X_test))
+        assert np.array_equal(compiled.predict(X_test), model.predict(X_test))
+
+def test_leaf_counts_are_normalized():
+    # sklearn < 1.4 keeps class counts in tree_.value; rebuild a forest's trees that way
+    model, X_test = fitted_forest()
+    estimators = []
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        counts = np.round(tree.value * tree.weighted_n_node_samples[:, None, None])
+        estimators.append(SimpleNamespace(tree_=SimpleNamespace(
+            node_count=tree.node_count, children_left=tree.children_left, children_right=tree.children_right,
+            feature=tree.feature, threshold=tree.threshold, max_depth=tree.max_depth, value=counts)))
+    counted = SimpleNamespace(estimators_=estimators, classes_=model.classes_)
+    assert counted.estimators_[0].tree_.value.sum(axis=2).max() > 1
+
+    compiled = CompiledForest.from_sklearn(counted)
+    assert np.allclose(compiled.predict_proba(X_test).sum(axis=1), 1)
+    assert np.allclose(compiled.predict_proba(X_test), model.predict_proba(X_test), rtol=0, atol=1e-12)
+    assert np.array_equal(compiled.predict(X_test), model.predict(X_test))
+
+def test_table_and_saved_copy_match_forest():
+    model, X_test = fitted_forest()
+    compiled = CompiledForest.from_sklearn(model).build_table(FEATURE_DOMAIN)
+    expected = model.predict(X_test)
+    assert np.array_equal(compiled.predict(X_test), expected)
+    assert [compiled.predict_one(*row) for row in X_test] == expected.tolist()
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'jodi.npz')
+        compiled.save(path)
+        loaded = CompiledForest.load(path)
+    assert np.array_equal(loaded.table, compiled.table)
+    assert np.array_equal(loaded.predict(X_test), expected)
+    assert np.array_equal(loaded.predict_proba(X_test), model.predict_proba(X_test))
+
+if __name__ == "__main__":
+    for test in (test_matches_forest_on_held_out_rows, test_leaf_counts_are_normalized,
+                 test_table_and_saved_copy_match_forest):
+        test()
+        print(f"[OK] {test.__name__}")
@@ -0,0 +1,67 @@
+"""
+KalyanMatkaPredictor's running statistics across reloads with different windows
+
+    python -m pytest test_matka_predictor.py    (or: python test_matka_predictor.py)
+"""
+import contextlib
+import io
+import os
+import tempfile
+from datetime import datetime, timedelta
+import numpy as np
+from history_store import HistoryStore
+from hot_cold import HotColdTracker
+from matka_predictor import KalyanMatkaPredictor, generate_history
+from pattern_stats import PatternStats
+from transition_model import TransitionModel
+
+def assert_matches_fresh_build(predictor):
+    """Every running model equals one built from scratch over predictor.data"""
+    data = predictor.data
+    stats, fresh = predictor.get_stats(), PatternStats.from_frame(data)
+    assert stats.total == fresh.total == len(data)
+    for category in fresh.counts:
+        assert np.array_equal(stats.counts[category], fresh.counts[category])
+    assert np.array_equal(stats.weekday_sum, fresh.weekday_sum)
+    assert np.array_equal(stats.month_count, fresh.month_count)
+
+    hot_cold, fresh = predictor.get_hot_cold(), HotColdTracker.from_frame(data)
+    assert np.array_equal(hot_cold.recent(), fresh.recent())
+    for window in fresh.windows:
+        assert np.array_equal(hot_cold.window_counts(window), fresh.window_counts(window))
+
+    transitions = predictor.get_transitions()
+    fresh = TransitionModel.from_frame(data, window=max(1, len(data) - 1))
+    assert transitions.window == fresh.window
+    assert np.array_equal(transitions.jodi_counts, fresh.jodi_counts)
+    assert transitions.last_jodi == fresh.last_jodi
+
+def test_reloads_with_different_windows():
+    with tempfile.TemporaryDirectory() as folder, contextlib.redirect_stdout(io.StringIO()):
+        store = HistoryStore(os.path.join(folder, 'history'))
+        store.append(generate_history(400, rng=3))
+        predictor = KalyanMatkaPredictor()
+        for days in (365, 180, 365, 60, 30, 200, 200):
+            predictor.load_history(store, days=days)
+            assert len(predictor.data) == days
+            assert_matches_fresh_build(predictor)
+
+def test_imported_history_is_only_simulated_on_request():
+    with tempfile.TemporaryDirectory() as folder, contextlib.redirect_stdout(io.StringIO()):
+        # Imported results ending a week ago, shorter than the window
+        store = HistoryStore(os.path.join(folder, 'history'))
+        store.append(generate_history(50, end=datetime.now() - timedelta(days=7), rng=4))
+        first, last = store.first_date, store.last_date
+        predictor = KalyanMatkaPredictor()
+        predictor.load_history(store, days=90)
+        assert (len(store), store.first_date, store.last_date) == (50, first, last)
+        assert len(predictor.data) == 50
+
+        predictor.load_history(store, days=90, simulate=True)
+        assert len(store) == 90 and store.first_date < first
+        assert len(predictor.data) == 90
+
+if __name__ == "__main__":
+    for test in (test_reloads_with_different_windows, test_imported_history_is_only_simulated_on_request):
+        test()
+        print(f"[OK] {test.__name__}")
@@ -0,0 +1,45 @@
+"""
+ModelCache reuse and warm-start extension of cached forests
+
+    python -m pytest test_model_cache.py    (or: python test_model_cache.py)
+"""
+import contextlib
+import io
+import tempfile
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from model_cache import ModelCache
+
+def window(offset, rows=300):
+    """Sliding window of a fixed synthetic series; every window holds classes 0-4"""
+    rng = np.random.default_rng(0)
+    X = rng.integers(0, 30, size=(rows + 50, 3))
+    y = (X.sum(axis=1) + rng.integers(0, 3, size=rows + 50)) % 5
+    return X[offset:offset + rows], y[offset:offset + rows]
+
+def test_same_data_is_loaded_from_cache():
+    with tempfile.TemporaryDirectory() as folder, contextlib.redirect_stdout(io.StringIO()):
+        cache = ModelCache(folder)
+        X, y = window(0)
+        first = cache.fit(RandomForestClassifier(n_estimators=20, random_state=1), X, y, name='jodi')
+        again = cache.fit(RandomForestClassifier(n_estimators=20, random_state=1), X, y, name='jodi')
+        assert np.array_equal(again.predict_proba(X), first.predict_proba(X))
+        assert len(cache.index) == 1
+
+def test_extensions_draw_new_tree_seeds():
+    with tempfile.TemporaryDirectory() as folder:
+        cache = ModelCache(folder, extra_trees=5)
+        out = io.StringIO()
+        for offset in range(8):
+            X, y = window(offset)
+            with contextlib.redirect_stdout(out):
+                model = cache.fit(RandomForestClassifier(n_estimators=20, random_state=1), X, y, name='jodi')
+            # Every tree keeps a seed of its own, however often the forest was extended
+            assert len(model.estimators_) == 20
+            assert len({tree.random_state for tree in model.estimators_}) == 20
+        assert out.getvalue().count("Extended cached jodi model") == 7
+
+if __name__ == "__main__":
+    for test in (test_same_data_is_loaded_from_cache, test_extensions_draw_new_tree_seeds):
+        test()
+        print(f"[OK] {test.__name__}")
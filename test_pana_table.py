@@ -0,0 +1,24 @@
+"""
+sample_panas draws distinct valid panas, optionally limited to some anks
+
+    python -m pytest test_pana_table.py    (or: python test_pana_table.py)
+"""
+import numpy as np
+from pana_table import is_valid_pana, pana_ank, sample_panas
+
+def test_panas_for_the_given_anks():
+    panas = sample_panas(12, anks=[3, 7, 3], rng=1)
+    assert len(panas) == len(set(panas.tolist())) == 12
+    assert is_valid_pana(panas).all()
+    assert set(pana_ank(panas).tolist()) <= {3, 7}
+
+def test_empty_anks_limit_nothing():
+    for anks in ([], (), np.array([], dtype=np.int64)):
+        panas = sample_panas(5, anks=anks, rng=2)
+        assert np.array_equal(panas, sample_panas(5, rng=2))
+        assert is_valid_pana(panas).all()
+
+if __name__ == "__main__":
+    for test in (test_panas_for_the_given_anks, test_empty_anks_limit_nothing):
+        test()
+        print(f"[OK] {test.__name__}")
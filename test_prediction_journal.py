@@ -0,0 +1,36 @@
+"""
+PredictionJournal: every prediction is kept, only out-of-sample ones are scored
+
+    python -m pytest test_prediction_journal.py    (or: python test_prediction_journal.py)
+"""
+import os
+import tempfile
+from datetime import datetime
+from matka_predictor import generate_history
+from prediction_journal import PredictionJournal
+
+def test_known_draw_is_journaled_but_not_scored():
+    with tempfile.TemporaryDirectory() as folder:
+        journal = PredictionJournal(os.path.join(folder, 'predictions.db'))
+        journal.record_draws('Kalyan', generate_history(10, end=datetime(2026, 10, 17), rng=1),
+                             recorded_at=datetime(2026, 10, 17, 21))
+
+        # The 17th was already drawn when this was made; the 18th was not
+        assert journal.record('Kalyan', {'date': '2026-10-17', 'ml_prediction': 42}, run_at=datetime(2026, 10, 17, 22)) == 1
+        assert journal.record('Kalyan', {'date': '2026-10-18', 'ml_prediction': 42}, run_at=datetime(2026, 10, 18, 9)) == 1
+        assert len(journal.hit_rates()) == 0
+
+        draw = generate_history(1, end=datetime(2026, 10, 18), rng=2)
+        journal.record_draws('Kalyan', draw, recorded_at=datetime(2026, 10, 18, 21))
+        predictions = journal.predictions('Kalyan')
+        assert predictions['draw_date'].tolist() == ['2026-10-17', '2026-10-18']
+        assert predictions['actual_jodi'].isna().tolist() == [True, False]
+        assert int(predictions['actual_jodi'].iloc[1]) == int(draw['jodi'].iloc[0])
+        rates = journal.hit_rates('Kalyan').set_index('strategy')
+        assert rates.loc['ml_prediction', 'scored'] == 1
+        journal.close()
+
+if __name__ == "__main__":
+    for test in (test_known_draw_is_journaled_but_not_scored,):
+        test()
+        print(f"[OK] {test.__name__}")
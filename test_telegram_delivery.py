@@ -0,0 +1,114 @@
+"""
+DeliveryQueue against MockTransport: delivery counts, 429 retries and send spacing
+
+    python -m pytest test_telegram_delivery.py    (or: python test_telegram_delivery.py)
+"""
+import asyncio
+from telegram_delivery import MAX_MESSAGE_CHARS, DeliveryQueue, DeliveryRejected, MockTransport
+
+# asyncio timers may fire up to a clock tick early
+TOLERANCE = 0.01
+
+def gaps(times):
+    return [later - earlier for earlier, later in zip(times, times[1:])]
+
+def test_broadcast_reaches_every_chat_at_the_global_rate():
+    async def run():
+        transport = MockTransport()
+        queue = DeliveryQueue(transport, messages_per_second=20)
+        await queue.broadcast("report", range(10))
+        await queue.close()
+        return transport, queue
+
+    transport, queue = asyncio.run(run())
+    assert sorted(chat_id for chat_id, _, _ in transport.sent) == list(range(10))
+    assert queue.stats['queued'] == queue.stats['sent'] == 10
+    assert queue.stats['retries'] == queue.stats['failed'] == 0
+    assert min(gaps([sent_at for _, _, sent_at in transport.sent])) >= 1 / 20 - TOLERANCE
+
+def test_one_chat_waits_its_interval():
+    async def run():
+        transport = MockTransport()
+        queue = DeliveryQueue(transport, chat_interval=0.2)
+        for text in ("first", "second", "third"):
+            await queue.enqueue(42, text)
+            # Wait for each send, so the messages are not merged into one
+            await queue.join()
+        await queue.close()
+        return transport, queue
+
+    transport, queue = asyncio.run(run())
+    assert [text for _, text, _ in transport.sent] == ["first", "second", "third"]
+    assert queue.stats['sent'] == 3 and queue.stats['batched'] == 0
+    assert min(gaps([sent_at for _, _, sent_at in transport.sent])) >= 0.2 - TOLERANCE
+
+def test_rate_limited_sends_are_retried_after_the_pause():
+    async def run():
+        transport = MockTransport(flood_every=3, retry_after=0.1)
+        queue = DeliveryQueue(transport, messages_per_second=100)
+        await queue.broadcast("report", range(8))
+        await queue.close()
+        return transport, queue
+
+    transport, queue = asyncio.run(run())
+    assert sorted(chat_id for chat_id, _, _ in transport.sent) == list(range(8))
+    assert queue.stats['sent'] == 8 and queue.stats['failed'] == 0
+    # Every 429 costs one extra call and one retry
+    rate_limited = transport.calls - len(transport.sent)
+    assert rate_limited > 0
+    assert queue.stats['rate_limited'] == queue.stats['retries'] == rate_limited
+    # A 429 holds every worker for retry_after
+    assert max(gaps([sent_at for _, _, sent_at in transport.sent])) >= 0.1 - TOLERANCE
+
+def test_waiting_messages_for_a_chat_are_merged():
+    async def run():
+        transport = MockTransport()
+        queue = DeliveryQueue(transport)
+        # Nothing is sent until this coroutine yields, so all three wait together
+        for text in ("a", "b", "c"):
+            await queue.enqueue(7, text)
+        await queue.close()
+        return transport, queue
+
+    transport, queue = asyncio.run(run())
+    assert [(chat_id, text) for chat_id, text, _ in transport.sent] == [(7, "a\n\nb\n\nc")]
+    assert queue.stats['sent'] == 3 and queue.stats['batched'] == 2
+
+def test_oversized_message_is_sent_in_pieces():
+    async def run():
+        transport = MockTransport()
+        queue = DeliveryQueue(transport, chat_interval=0)
+        await queue.enqueue(1, "x" * (2 * MAX_MESSAGE_CHARS + 10))
+        await queue.close()
+        return transport, queue
+
+    transport, queue = asyncio.run(run())
+    assert [len(text) for _, text, _ in transport.sent] == [MAX_MESSAGE_CHARS, MAX_MESSAGE_CHARS, 10]
+    assert queue.stats['sent'] == 1
+
+def test_rejected_chat_is_not_retried():
+    class BlockedTransport(MockTransport):
+        async def send(self, chat_id, text):
+            if chat_id == 'blocked':
+                self.calls += 1
+                raise DeliveryRejected("bot was blocked by the user")
+            await super().send(chat_id, text)
+
+    async def run():
+        transport = BlockedTransport()
+        queue = DeliveryQueue(transport)
+        await queue.broadcast("report", ['blocked', 'open'])
+        await queue.close()
+        return transport, queue
+
+    transport, queue = asyncio.run(run())
+    assert [chat_id for chat_id, _, _ in transport.sent] == ['open']
+    assert transport.calls == 2
+    assert queue.stats['sent'] == 1 and queue.stats['failed'] == 1 and queue.stats['retries'] == 0
+
+if __name__ == "__main__":
+    for test in (test_broadcast_reaches_every_chat_at_the_global_rate, test_one_chat_waits_its_interval,
+                 test_rate_limited_sends_are_retried_after_the_pause, test_waiting_messages_for_a_chat_are_merged,
+                 test_oversized_message_is_sent_in_pieces, test_rejected_chat_is_not_retried):
+        test()
+        print(f"[OK] {test.__name__}")
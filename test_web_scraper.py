@@ -0,0 +1,122 @@
+"""
+WebScraper against a local http.server serving fixture result pages
+
+    python -m pytest test_web_scraper.py    (or: python test_web_scraper.py)
+"""
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from data_utils import WebScraper
+from history_store import HistoryStore
+
+# Newest-first result page, the way most matka sites list them
+RESULTS_PAGE = """<html><body><table>
+<tr><td>18/10/2026</td><td>Kalyan</td><td>128-15-140</td></tr>
+<tr><td>17/10/2026</td><td>Kalyan</td><td>370-03-157</td></tr>
+<tr><td>16/10/2026</td><td>Kalyan</td><td>550-08-233</td></tr>
+<tr><td>15/10/2026</td><td>Kalyan</td><td>119-17-340</td></tr>
+</table></body></html>
+"""
+ROBOTS = "User-agent: *\nDisallow: /private/\n"
+ETAG = '"results-v1"'
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    requests = []
+
+    def do_GET(self):
+        FixtureHandler.requests.append((self.path, self.headers.get('If-None-Match')))
+        if self.path == '/robots.txt':
+            body, headers = ROBOTS, {}
+        elif self.path == '/results':
+            if self.headers.get('If-None-Match') == ETAG:
+                self.send_response(304)
+                self.end_headers()
+                return
+            body, headers = RESULTS_PAGE, {'ETag': ETAG}
+        else:
+            self.send_error(404)
+            return
+        data = body.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+class FixtureServer:
+    def __enter__(self):
+        FixtureHandler.requests = []
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), FixtureHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}'
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+def test_ingest_then_not_modified():
+    with FixtureServer() as server, tempfile.TemporaryDirectory() as folder:
+        store = HistoryStore(os.path.join(folder, 'history'))
+        cache_file = os.path.join(folder, 'http_cache.json')
+        scraper = WebScraper(rate_limit=0, cache_file=cache_file)
+
+        # 200: every row is ingested and the ETag kept for next time
+        assert scraper.ingest(server.url + '/results', store) == 4
+        assert str(store.last_date) == '2026-10-18'
+        assert store.load()['jodi'].tolist() == [17, 8, 3, 15]
+        assert scraper.validators[server.url + '/results']['etag'] == ETAG
+        assert os.path.exists(cache_file)
+
+        # 304: a new scraper sends the saved ETag and gets nothing to ingest
+        scraper = WebScraper(rate_limit=0, cache_file=cache_file)
+        assert scraper.ingest(server.url + '/results', store) == 0
+        assert FixtureHandler.requests[-1] == ('/results', ETAG)
+        assert len(store) == 4
+
+def test_newest_first_stops_at_known_draw():
+    with FixtureServer() as server, tempfile.TemporaryDirectory() as folder:
+        store = HistoryStore(os.path.join(folder, 'history'))
+        scraper = WebScraper(rate_limit=0, cache_file=None)
+        rows = list(scraper.stream_results(server.url + '/results', since='2026-10-16'))
+        assert [row['date'] for row in rows] == ['2026-10-18', '2026-10-17']
+
+        # Stopping early does not save the ETag; ingest does once the rows are stored
+        assert server.url + '/results' not in scraper.validators
+        assert scraper.ingest(server.url + '/results', store) == 4
+        assert scraper.validators[server.url + '/results']['etag'] == ETAG
+
+def test_failed_ingest_keeps_no_etag():
+    class FailingStore(HistoryStore):
+        def append(self, data):
+            raise OSError("disk full")
+
+    with FixtureServer() as server, tempfile.TemporaryDirectory() as folder:
+        scraper = WebScraper(rate_limit=0, cache_file=None)
+        try:
+            scraper.ingest(server.url + '/results', FailingStore(os.path.join(folder, 'history')))
+        except OSError:
+            pass
+        # The rows never got stored, so the next fetch must not be answered with a 304
+        assert server.url + '/results' not in scraper.validators
+        rows = list(scraper.stream_results(server.url + '/results'))
+        assert len(rows) == 4
+        assert FixtureHandler.requests[-1] == ('/results', None)
+
+def test_robots_disallowed_page_is_skipped():
+    with FixtureServer() as server:
+        scraper = WebScraper(rate_limit=0, cache_file=None)
+        assert list(scraper.fetch_lines(server.url + '/private/results')) == []
+        assert all(path != '/private/results' for path, _ in FixtureHandler.requests)
+
+if __name__ == "__main__":
+    for test in (test_ingest_then_not_modified, test_newest_first_stops_at_known_draw,
+                 test_failed_ingest_keeps_no_etag, test_robots_disallowed_page_is_skipped):
+        test()
+        print(f"[OK] {test.__name__}")
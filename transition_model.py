@@ -0,0 +1,156 @@
+import numpy as np
+from pattern_stats import JODI_RANGE
+
+JODI_LOW = JODI_RANGE[0]
+JODI_STATES = JODI_RANGE[1] - JODI_RANGE[0]
+
+# Decayed weights grow as 1/decay per draw; rescale before they could overflow
+_MAX_WEIGHT = 1e150
+
+class TransitionModel:
+    """
+    Markov transition counts from one draw's jodi (and open ank) to the next
+    Dense 90x90 jodi and 10x10 ank matrices, so adding a draw is O(1) and
+    ranking the next draw's candidates is a single row sort.
+
+    With `window`, only the last `window` transitions count: a ring buffer
+    subtracts the one that falls out. With `decay` < 1, each transition is
+    worth `decay` times the one after it; new transitions are weighted up
+    instead of every old count being scaled down, which ranks the same.
+    Jodis outside 10-99 move the current state but are not counted.
+    """
+    def __init__(self, window=None, decay=1.0):
+        if not 0 < decay <= 1:
+            raise ValueError(f"decay must be in (0, 1], got {decay}")
+        self.window = window
+        self.decay = decay
+        self.jodi_counts = np.zeros((JODI_STATES, JODI_STATES))
+        self.ank_counts = np.zeros((10, 10))
+        if window:
+            self.ring_from = np.zeros(window, dtype=np.int64)
+            self.ring_to = np.zeros(window, dtype=np.int64)
+            self.ring_weight = np.zeros(window)
+        self.weight = 1.0
+        self.transitions = 0
+        self.last_jodi = None
+
+    @classmethod
+    def from_frame(cls, data, window=None, decay=1.0):
+        """Build a model from a history DataFrame in date order"""
+        model = cls(window, decay)
+        if len(data):
+            model.extend(data.sort_values('date', kind='stable')['jodi'])
+        return model
+
+    def _apply(self, previous, following, weights):
+        """Add weighted transitions (arrays); invalid jodis are skipped"""
+        valid = (previous >= JODI_LOW) & (following >= JODI_LOW)
+        previous, following, weights = previous[valid], following[valid], weights[valid]
+        np.add.at(self.jodi_counts, (previous - JODI_LOW, following - JODI_LOW), weights)
+        np.add.at(self.ank_counts, (previous // 10, following // 10), weights)
+
+    def _rescale(self):
+        self.jodi_counts /= self.weight
+        self.ank_counts /= self.weight
+        if self.window:
+            self.ring_weight /= self.weight
+        self.weight = 1.0
+
+    def push(self, jodi):
+        """Record a single new draw"""
+        jodi = int(jodi)
+        previous, self.last_jodi = self.last_jodi, jodi
+        if previous is None:
+            return
+
+        weight = self.weight
+        if self.window:
+            slot = self.transitions % self.window
+            if self.transitions >= self.window:
+                old_from, old_to = self.ring_from[slot], self.ring_to[slot]
+                if old_from >= JODI_LOW and old_to >= JODI_LOW:
+                    self.jodi_counts[old_from - JODI_LOW, old_to - JODI_LOW] -= self.ring_weight[slot]
+                    self.ank_counts[old_from // 10, old_to // 10] -= self.ring_weight[slot]
+            self.ring_from[slot], self.ring_to[slot], self.ring_weight[slot] = previous, jodi, weight
+        if previous >= JODI_LOW and jodi >= JODI_LOW:
+            self.jodi_counts[previous - JODI_LOW, jodi - JODI_LOW] += weight
+            self.ank_counts[previous // 10, jodi // 10] += weight
+        self.transitions += 1
+
+        if self.decay < 1:
+            self.weight /= self.decay
+            if self.weight > _MAX_WEIGHT:
+                self._rescale()
+
+    def extend(self, jodis):
+        """Record many draws in date order in one vectorized step"""
+        jodis = np.asarray(jodis, dtype=np.int64)
+        if len(jodis) == 0:
+            return
+        if self.last_jodi is None:
+            previous, following = jodis[:-1], jodis[1:]
+        else:
+            previous, following = np.concatenate([[self.last_jodi], jodis[:-1]]), jodis
+        self.last_jodi = int(jodis[-1])
+        added = len(following)
+        if added == 0:
+            return
+
+        if self.decay < 1:
+            # Rescale so the newest transition weighs 1 and older ones decay^age
+            scale = self.decay ** (added - 1) / self.weight
+            self.jodi_counts *= scale
+            self.ank_counts *= scale
+            if self.window:
+                self.ring_weight *= scale
+            weights = self.decay ** np.arange(added - 1, -1, -1, dtype=np.float64)
+            self.weight = 1 / self.decay
+        else:
+            weights = np.ones(added)
+
+        start = self.transitions
+        if self.window:
+            # Stored transitions pushed out of the window, then the new ones that stay in it
+            evicted = np.arange(max(0, start - self.window), min(start, start + added - self.window)) % self.window
+            self._apply(self.ring_from[evicted], self.ring_to[evicted], -self.ring_weight[evicted])
+            first = max(0, added - self.window)
+            slots = np.arange(start + first, start + added) % self.window
+            previous, following, weights = previous[first:], following[first:], weights[first:]
+            self.ring_from[slots], self.ring_to[slots], self.ring_weight[slots] = previous, following, weights
+        self._apply(previous, following, weights)
+        self.transitions += added
+
+    @staticmethod
+    def _rank(row, fallback, k):
+        # Unseen states fall back to how often each value followed anything
+        if not (row > 0).any():
+            row = fallback
+        return np.argsort(-row, kind='stable')[:k]
+
+    def candidates(self, k=5, last_jodi=None):
+        """
+        Most likely next jodis after `last_jodi` (default: the last draw)
+        Ties are broken by the smaller jodi.
+        """
+        last = self.last_jodi if last_jodi is None else int(last_jodi)
+        if last is None or not JODI_LOW <= last < JODI_LOW + JODI_STATES:
+            row = np.zeros(JODI_STATES)
+        else:
+            row = self.jodi_counts[last - JODI_LOW]
+        return (self._rank(row, self.jodi_counts.sum(axis=0), k) + JODI_LOW).tolist()
+
+    def ank_candidates(self, k=3, last_ank=None):
+        """Most likely next open anks after `last_ank` (default: the last draw's)"""
+        if last_ank is None:
+            last_ank = None if self.last_jodi is None else self.last_jodi // 10
+        row = np.zeros(10) if last_ank is None else self.ank_counts[int(last_ank)]
+        return self._rank(row, self.ank_counts.sum(axis=0), k).tolist()
+
+    def predict_path(self, steps, last_jodi=None):
+        """The chain of most likely jodis for the next `steps` draws"""
+        path = []
+        last = self.last_jodi if last_jodi is None else last_jodi
+        for _ in range(steps):
+            last = self.candidates(1, last_jodi=last)[0]
+            path.append(last)
+        return path